@@ -33,28 +33,78 @@ Ejemplo de uso:
     $ penlab config show
 """
 
-import click
-from rich.console import Console
+import importlib
 
-# Importaciones de los subcomandos.
-from penlab.commands.init_cmd import init
-from penlab.commands.list_cmd import list_projects
-from penlab.commands.info_cmd import info
-from penlab.commands.templates_cmd import templates
-from penlab.commands.config_cmd import config
+import click
 
-from penlab.ui import show_banner
-from penlab.config import ensure_penlab_structure
-from penlab.notes import notes as notes_cli # Pendiente de validación y habilitación # 
+# ============================================================
+# REGISTRO DE COMANDOS
+# ============================================================
+# Cada subcomando se declara como ("módulo:atributo", ayuda breve) y solo se
+# importa (junto con Rich, YAML, etc.) cuando se invoca. La ayuda breve
+# permite mostrar `penlab --help` sin importar ningún subcomando.
+LAZY_COMMANDS = {
+    'init': ('penlab.commands.init_cmd:init', 'Inicializa un nuevo proyecto Penlab con la estructura de una template.'),
+    'list-projects': ('penlab.commands.list_cmd:list_projects', 'Lista todos los proyectos Penlab en el directorio actual.'),
+    'info': ('penlab.commands.info_cmd:info', 'Muestra información detallada de un proyecto Penlab.'),
+    'templates': ('penlab.commands.templates_cmd:templates', 'Gestión de templates'),
+    'config': ('penlab.commands.config_cmd:config', 'Gestiona la configuración global de Penlab.'),
+
+    # (Pendiente de habilitar: módulo de notas)
+    # 'notes': ('penlab.notes:notes', 'Gestión de notas del proyecto'),
+}
 
-console = Console()
+# ============================================================
+# CLASE: LazyGroup
+# ============================================================
+class LazyGroup (click.Group):
+    """
+    Grupo de Click que importa los subcomandos bajo demanda.
 
-ensure_penlab_structure()
+    Los comandos registrados en `lazy_commands` no se cargan al arrancar
+    la CLI, sino la primera vez que Click los necesita para ejecutarlos.
+    La ayuda del grupo usa la descripción breve del registro.
+    """
+    def __init__ (self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands (self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command (self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attr = self.lazy_commands[cmd_name][0].split(':')
+            self.add_command(getattr(importlib.import_module(module_name), attr), cmd_name)
+
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands (self, ctx, formatter):
+        names = self.list_commands(ctx)
+        if not names:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+
+        for name in names:
+            if name in self.commands:
+                if self.commands[name].hidden:
+                    continue
+                rows.append((name, self.commands[name].get_short_help_str(limit)))
+            else:
+                # Comando de paso, solo para reutilizar el recorte de la ayuda de Click.
+                placeholder = click.Command(name, help=self.lazy_commands[name][1])
+                rows.append((name, placeholder.get_short_help_str(limit)))
+
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
 
 # ============================================================
 # GRUPO PRINCIPAL: penlab
 # ============================================================
-@click.group(invoke_without_command=True)
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS, invoke_without_command=True)
 @click.pass_context
 def cli (ctx):
     """
@@ -64,24 +114,20 @@ def cli (ctx):
     una breve guía de uso.  
     Usa `penlab --help` para listar los subcomandos disponibles.
     """
+    # Se prepara `~/.penlab` aquí y no al importar el módulo, de modo que
+    # `penlab --help` no toca el sistema de archivos.
+    from penlab.config import ensure_penlab_structure
+
+    ensure_penlab_structure()
+
     if ctx.invoked_subcommand is None:
+        from penlab.ui import show_banner
+
         show_banner()
         click.echo()
         click.echo('Usa "penlab --help" para ver los comandos disponibles.')
         ctx.exit()
 
-# ============================================================
-# REGISTRO DE COMANDOS
-# ============================================================
-cli.add_command(init)
-cli.add_command(list_projects)
-cli.add_command(info)
-cli.add_command(templates)
-cli.add_command(config)
-
-# (Pendiente de habilitar: módulo de notas)
-# cli.add_command(notes_cli, name='notes')
-
 # ============================================================
 # FUNCIÓN PRINCIPAL
 # ============================================================
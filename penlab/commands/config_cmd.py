@@ -22,7 +22,10 @@ from rich.console import Console
 from rich.table import Table
 from rich import box
 
-from penlab.ui_theme import THEME
+from penlab.ui_theme import (
+    STYLE_PRIMARY, STYLE_SECONDARY, STYLE_INFO, STYLE_WARNING, STYLE_DIM,
+    STYLE_BORDER, STYLE_SUCCESS,
+)
 from penlab.config import load_config, save_config, CONFIG_FILE
 
 console = Console()
@@ -57,19 +60,19 @@ def show_config ():
     console.print()
     
     table = Table(
-        title=f'[{THEME["primary"]}]Configuración de Penlab[/{THEME["primary"]}]', 
+        title=f'[{STYLE_PRIMARY}]Configuración de Penlab[/{STYLE_PRIMARY}]', 
         box=box.ROUNDED,
-        border_style=THEME['border'],
-        header_style=f'bold {THEME["primary"]}'
+        border_style=STYLE_BORDER,
+        header_style=f'bold {STYLE_PRIMARY}'
     )
-    table.add_column('Clave', style=THEME['secondary'], no_wrap=True)
-    table.add_column('Valor', style=THEME['info'])
+    table.add_column('Clave', style=STYLE_SECONDARY, no_wrap=True)
+    table.add_column('Valor', style=STYLE_INFO)
 
     for key, value in config_data.items():
         table.add_row(key, str(value))
 
     console.print(table)
-    console.print(f'\n[{THEME["dim"]}]Archivo de configuración: {CONFIG_FILE}[/{THEME["dim"]}]\n')
+    console.print(f'\n[{STYLE_DIM}]Archivo de configuración: {CONFIG_FILE}[/{STYLE_DIM}]\n')
 
 # ============================================================
 # COMANDO: SET-CONFIG (establecer valores)
@@ -97,7 +100,7 @@ def set_config (key, value):
     save_config(config_data)
 
     console.print(
-        f'\n[{THEME["success"]}]✓[{THEME["info"]}] Configuración actualizada:[/{THEME["info"]}]'
-        f'[{THEME["secondary"]}]"{key}"[/{THEME["secondary"]}] = '
-        f'[{THEME["warning"]}]"{value}"[/{THEME["warning"]}]\n'
+        f'\n[{STYLE_SUCCESS}]✓[{STYLE_INFO}] Configuración actualizada:[/{STYLE_INFO}]'
+        f'[{STYLE_SECONDARY}]"{key}"[/{STYLE_SECONDARY}] = '
+        f'[{STYLE_WARNING}]"{value}"[/{STYLE_WARNING}]\n'
     )
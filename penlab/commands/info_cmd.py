@@ -21,9 +21,9 @@ import click
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
-import yaml
 
-from penlab.ui_theme import THEME
+from penlab.ui_theme import STYLE_PRIMARY, STYLE_SECONDARY, STYLE_ERROR, STYLE_DIM, STYLE_BORDER
+from penlab.project import load_project_metadata, PROJECT_META_FILE
 
 console = Console()
 
@@ -49,28 +49,27 @@ def info(project_name):
         $ penlab info prueba
     """
     project_path = Path(project_name).resolve()
-    meta_path = project_path / '.penlab.yaml'
+    meta_path = project_path / PROJECT_META_FILE
 
     if not meta_path.exists():
-        console.print(f'[{THEME["error"]}]✗[{THEME["dim"]}] No se encontró metadata en {meta_path}[/{THEME["dim"]}]')
+        console.print(f'[{STYLE_ERROR}]✗[{STYLE_DIM}] No se encontró metadata en {meta_path}[/{STYLE_DIM}]')
         return
 
-    with open(meta_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
+    data = load_project_metadata(project_path) or {}
 
     panel_content = (
-        f"[bold {THEME["secondary"]}]Proyecto:[/bold {THEME["secondary"]}] {data.get('name')}\n"
-        f"[bold {THEME["secondary"]}]Template:[/bold {THEME["secondary"]}] {data.get('template')}\n"
-        f"[bold {THEME["secondary"]}]Target:[/bold {THEME["secondary"]}] {data.get('target')}\n"
-        f"[bold {THEME["secondary"]}]Tu IP:[/bold {THEME["secondary"]}] {data.get('your-ip')}\n"
-        f"[bold {THEME["secondary"]}]Autor:[/bold {THEME["secondary"]}] {data.get('author')}\n"
-        f"[bold {THEME["secondary"]}]Creado:[/bold {THEME["secondary"]}] {data.get('created')}\n"
-        f"[bold {THEME["secondary"]}]Ruta:[/bold {THEME["secondary"]}] {data.get('path')}\n"
+        f"[bold {STYLE_SECONDARY}]Proyecto:[/bold {STYLE_SECONDARY}] {data.get('name')}\n"
+        f"[bold {STYLE_SECONDARY}]Template:[/bold {STYLE_SECONDARY}] {data.get('template')}\n"
+        f"[bold {STYLE_SECONDARY}]Target:[/bold {STYLE_SECONDARY}] {data.get('target')}\n"
+        f"[bold {STYLE_SECONDARY}]Tu IP:[/bold {STYLE_SECONDARY}] {data.get('your-ip')}\n"
+        f"[bold {STYLE_SECONDARY}]Autor:[/bold {STYLE_SECONDARY}] {data.get('author')}\n"
+        f"[bold {STYLE_SECONDARY}]Creado:[/bold {STYLE_SECONDARY}] {data.get('created')}\n"
+        f"[bold {STYLE_SECONDARY}]Ruta:[/bold {STYLE_SECONDARY}] {data.get('path')}\n"
     )
 
     console.print()
     console.print(Panel(
         panel_content, 
-        title=f"[{THEME["primary"]}]Información del Proyecto[/{THEME["primary"]}]", 
-        border_style=THEME['border']
+        title=f"[{STYLE_PRIMARY}]Información del Proyecto[/{STYLE_PRIMARY}]", 
+        border_style=STYLE_BORDER
     ))
\ No newline at end of file
@@ -19,24 +19,86 @@ Ejemplo de uso:
 """
 
 import os
+import re
+import sys
 import shutil
+import threading
 import click
+from collections import ChainMap
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
-from rich.console import Console
+from rich.console import Console, Group
+from rich.text import Text
 from rich.tree import Tree
 from rich.panel import Panel
 from rich.rule import Rule
 
 from penlab.config import load_config
 from penlab.templates import load_template
-from penlab.utils import sanitize_name, is_within_directory, simulate_structure
-from penlab.project import save_project_metadata, create_structure, create_file
+from penlab.utils import sanitize_name, simulate_structure, substitute_variables
+from penlab.project import save_project_metadata, create_structure, create_file, project_trash_name
 from penlab.ui import build_tree
-from penlab.ui_theme import THEME
+from penlab.ui_theme import (
+    STYLE_PRIMARY, STYLE_SECONDARY, STYLE_WARNING, STYLE_ERROR, STYLE_DIM,
+    STYLE_BORDER, STYLE_ACCENT, STYLE_TEXT, STYLE_SUCCESS,
+)
 
 console = Console()
 
+# Nombres de proyecto no permitidos: rutas absolutas o con unidad (C:),
+# separadores de directorio o secuencias "..".
+INVALID_PROJECT_NAME_REGEX = re.compile(r'^[A-Za-z]:|\.\.|[\\/]')
+
+# ============================================================
+# FUNCIÓN: _remove_directory
+# ============================================================
+def _remove_directory (path: Path):
+    """
+    Elimina un proyecto existente (`--force`) sin bloquear la creación del nuevo.
+
+    El directorio se renombra a `<nombre>.trash-<id>` (operación inmediata en
+    el mismo sistema de archivos) y se borra en un hilo en segundo plano. El
+    hilo no es *daemon*: el intérprete espera a que termine antes de salir.
+    Si no se puede renombrar (o no es un directorio real), se borra en el acto.
+    Si el borrado en segundo plano falla, se avisa de qué directorio quedó
+    (`list-projects` ignora los directorios `.trash-*`).
+
+    Args:
+        path (Path): Directorio a eliminar.
+
+    Raises:
+        OSError: Si el directorio no se puede eliminar.
+    """
+    if path.is_dir() and not path.is_symlink():
+        trash = path.with_name(project_trash_name(path.name))
+        try:
+            os.replace(path, trash)
+        except OSError:
+            pass
+        else:
+            threading.Thread(target=_remove_trash, args=(trash,)).start()
+            return
+
+    shutil.rmtree(path)
+
+def _remove_trash (trash: Path):
+    """ Borra un directorio `.trash-*` y avisa si no se pudo borrar entero. """
+    errors = []
+
+    # `onexc` sustituye a `onerror` (obsoleto) desde Python 3.12.
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(trash, onexc=lambda func, path, exc: errors.append((path, exc)))
+    else:
+        shutil.rmtree(trash, onerror=lambda func, path, exc_info: errors.append((path, exc_info[1])))
+
+    if errors:
+        path, exc = errors[0]
+        console.print(
+            f'[{STYLE_WARNING}]⚠ No se pudo eliminar por completo {trash} '
+            f'({len(errors)} errores; el primero en {path}: {exc})[/{STYLE_WARNING}]'
+        )
+
 # ============================================================
 # COMANDO: INIT (crear nuevo proyecto Penlab)
 # ============================================================
@@ -73,23 +135,23 @@ def init(project_name, template, target, your_ip, force, dry_run, yes):
         $ penlab init web01 -t web --target 10.10.10.10 --your-ip 10.10.14.5
         $ penlab init demo --dry-run
     """    
-    # Encabezado visual de inicio.
-    console.print(Rule(f'[bold {THEME["accent"]}] ⚔ PENLAB INIT [/bold {THEME["accent"]}]'))
-    console.print()
+    # Encabezado visual de inicio y panel con el resumen del nuevo proyecto,
+    # emitidos con una única llamada a `print`.
+    header = [Rule(f'[bold {STYLE_ACCENT}] ⚔ PENLAB INIT [/bold {STYLE_ACCENT}]'), Text()]
 
     if dry_run:
-        console.print(f'[{THEME["warning"]}][{THEME["text"]}] Modo DRY-RUN activado: no se crearán archivos reales. [/{THEME["text"]}]')
+        header.append(f'[{STYLE_WARNING}][{STYLE_TEXT}] Modo DRY-RUN activado: no se crearán archivos reales. [/{STYLE_TEXT}]')
 
-    # Panel inicial con resumen del nuevo proyecto.
-    console.print(
+    header.append(
         Panel.fit(
-            f'[{THEME["text"]}]Proyecto:[/{THEME["text"]}] [bold {THEME["accent"]}]{project_name}[/bold {THEME["accent"]}]\n'
-            f'[{THEME["text"]}]Template:[/{THEME["text"]}] [{THEME["secondary"]}]{template}[/{THEME["secondary"]}]',
-            border_style=THEME['border'],
-            title=f'[bold {THEME["accent"]}]Inicialización[/bold {THEME["accent"]}]',
-            subtitle=f'[{THEME["dim"]}]Penlab Hub [/{THEME["dim"]}]',
+            f'[{STYLE_TEXT}]Proyecto:[/{STYLE_TEXT}] [bold {STYLE_ACCENT}]{project_name}[/bold {STYLE_ACCENT}]\n'
+            f'[{STYLE_TEXT}]Template:[/{STYLE_TEXT}] [{STYLE_SECONDARY}]{template}[/{STYLE_SECONDARY}]',
+            border_style=STYLE_BORDER,
+            title=f'[bold {STYLE_ACCENT}]Inicialización[/bold {STYLE_ACCENT}]',
+            subtitle=f'[{STYLE_DIM}]Penlab Hub [/{STYLE_DIM}]',
         )
     )
+    console.print(Group(*header))
 
     # ============================================================
     # Carga de configuración y plantilla base
@@ -98,41 +160,49 @@ def init(project_name, template, target, your_ip, force, dry_run, yes):
     template_data = load_template(template)
 
     if not template_data:
-        console.print(f'[{THEME["error"]}]✗[{THEME["text"]}] No se pudo cargar la template.[/{THEME["text"]}]')
+        console.print(f'[{STYLE_ERROR}]✗[{STYLE_TEXT}] No se pudo cargar la template.[/{STYLE_TEXT}]')
         return
 
     template_defaults = template_data.get('variables', {}) or {}
 
-    def resolve_var(key, cli_value=None, fallback=''):
-        if cli_value not in (None, ''):
-            return cli_value
-        if key in template_defaults and template_defaults[key] not in (None, ''):
-            return template_defaults[key]
-        if key in config and config[key] not in (None, ''):
-            return config[key]
-        return fallback
+    # Prioridad de las variables: CLI > valores por defecto de la template >
+    # configuración global. Los valores vacíos se descartan de antemano.
+    def non_empty(values):
+        return {k: v for k, v in values.items() if v not in (None, '')}
+
+    chain = ChainMap(
+        non_empty({'target': target, 'your-ip': your_ip}),
+        non_empty(template_defaults),
+        non_empty(config),
+    )
+
+    # Un único instante para `{date}` y para la fecha de la metadata.
+    now = datetime.now()
 
     variables = {
         'project-name': project_name,
-        'target': resolve_var('target', cli_value=target, fallback='TARGET_IP'),
-        'your-ip': resolve_var('your-ip', cli_value=your_ip, fallback=config.get('your-ip', '10.10.x.x')),
-        'date': datetime.now().strftime('%Y-%m-%d'),
-        'author': resolve_var('author', fallback=config.get('author', 'pentester')),
+        'target': chain.get('target', 'TARGET_IP'),
+        'your-ip': chain.get('your-ip', '10.10.x.x'),
+        'date': now.strftime('%Y-%m-%d'),
+        'author': chain.get('author', 'pentester'),
     }
 
     # ============================================================
     # Validaciones de entrada
     # ============================================================
-    if os.path.isabs(project_name) or any(p in project_name for p in ('..', '/', '\\')):
-        console.print(f'[{THEME["error"]}]✗[{THEME["text"]}] Nombre de proyecto inválido.[/{THEME["text"]}]')
+    if INVALID_PROJECT_NAME_REGEX.search(project_name):
+        console.print(f'[{STYLE_ERROR}]✗[{STYLE_TEXT}] Nombre de proyecto inválido.[/{STYLE_TEXT}]')
         return
 
     project_name_safe = sanitize_name(project_name, replace_with='-')
     project_path = (Path.cwd() / project_name_safe).resolve()
     cwd = Path.cwd().resolve()
 
-    if not is_within_directory(cwd, project_path):
-        console.print(f'[{THEME["error"]}]✗[{THEME["text"]}] Nombre inválido: intenta crear fuera del directorio actual.')
+    # Ambas rutas ya están resueltas: basta con comparar prefijos, sin volver
+    # a resolver. `join(cwd, '')` añade el separador final (también para `/`),
+    # de modo que el propio directorio actual no cuenta como "dentro".
+    if not os.fspath(project_path).startswith(os.path.join(cwd, '')):
+        console.print(f'[{STYLE_ERROR}]✗[{STYLE_TEXT}] Nombre inválido: intenta crear fuera del directorio actual.')
         return
 
     # ============================================================
@@ -140,47 +210,45 @@ def init(project_name, template, target, your_ip, force, dry_run, yes):
     # ============================================================
     if project_path.exists():
         if dry_run:
-            console.print(f'[{THEME["warning"]}][/{THEME["warning"]}] [{THEME["dim"]}]DRY-RUN: El directorio ya existe y sería eliminado con --force[/{THEME["dim"]}]')
+            console.print(f'[{STYLE_WARNING}][/{STYLE_WARNING}] [{STYLE_DIM}]DRY-RUN: El directorio ya existe y sería eliminado con --force[/{STYLE_DIM}]')
         elif not force:
-            console.print(f'[{THEME["error"]}]✗[/{THEME["error"]}] El directorio [{THEME["secondary"]}]{project_name}[/{THEME["secondary"]}] ya existe.')
+            console.print(f'[{STYLE_ERROR}]✗[/{STYLE_ERROR}] El directorio [{STYLE_SECONDARY}]{project_name}[/{STYLE_SECONDARY}] ya existe.')
             return
         else:
             if not yes:
                 console.print(
                     Panel.fit(
-                        f'[{THEME["warning"]}]⚠ Esto eliminará el directorio existente:[/{THEME["warning"]}]\\n[{THEME["dim"]}] {project_path} [/{THEME["dim"]}]',
-                        title=f'[bold {THEME["primary"]}]Confirmación requerida[/{THEME["primary"]}]',
-                        border_style=THEME['warning'],
+                        f'[{STYLE_WARNING}]⚠ Esto eliminará el directorio existente:[/{STYLE_WARNING}]\\n[{STYLE_DIM}] {project_path} [/{STYLE_DIM}]',
+                        title=f'[bold {STYLE_PRIMARY}]Confirmación requerida[/{STYLE_PRIMARY}]',
+                        border_style=STYLE_WARNING,
                     )
                 )
                 if not click.confirm('¿Deseas continuar?', default=False):
-                    console.print(f'[{THEME["warning"]}]Operación cancelada.[/{THEME["warning"]}]')
+                    console.print(f'[{STYLE_WARNING}]Operación cancelada.[/{STYLE_WARNING}]')
                     return
             try:
-                shutil.rmtree(project_path)
-                console.print(f'[{THEME["error"]}][/{THEME["error"]}] [{THEME["success"]}]Directorio existente eliminado.[/{THEME["success"]}]')
+                _remove_directory(project_path)
+                console.print(f'[{STYLE_ERROR}][/{STYLE_ERROR}] [{STYLE_SUCCESS}]Directorio existente eliminado.[/{STYLE_SUCCESS}]')
             except Exception as e:
-                console.print(f'[{THEME["error"]}]✗ Error al eliminar directorio existente:[/{THEME["error"]}] {e}')
+                console.print(f'[{STYLE_ERROR}]✗ Error al eliminar directorio existente:[/{STYLE_ERROR}] {e}')
                 return
 
     # ============================================================
     # Simulación (modo DRY-RUN)
     # ============================================================
     if dry_run:
-        console.print(Rule(f'[bold {THEME["primary"]}]Simulación de estructura[/bold {THEME["primary"]}]', style=THEME['border']))
+        console.print(Rule(f'[bold {STYLE_PRIMARY}]Simulación de estructura[/bold {STYLE_PRIMARY}]', style=STYLE_BORDER))
         simulate_structure(project_path, template_data.get('structure', []), variables)
 
         global_files = template_data.get('global_files', [])
         if global_files:
-            console.print(f'\n[{THEME["secondary"]}]📄 Archivos globales:[/{THEME["secondary"]}]')
+            console.print(f'\n[{STYLE_SECONDARY}]📄 Archivos globales:[/{STYLE_SECONDARY}]')
             for file_info in global_files:
                 if isinstance(file_info, dict) and 'name' in file_info:
-                    file_name = str(file_info['name'])
-                    for var, val in variables.items():
-                        file_name = file_name.replace(f'{{{var}}}', val)
-                    console.print(f'  [{THEME["dim"]}]•[/{THEME["dim"]}] {project_path / sanitize_name(file_name, "_")}')
+                    file_name = substitute_variables(str(file_info['name']), variables)
+                    console.print(f'  [{STYLE_DIM}]•[/{STYLE_DIM}] {project_path / sanitize_name(file_name, "_")}')
 
-        console.print(f'\n[{THEME["success"]}]✓ DRY-RUN completado. No se han creado archivos.[/{THEME["success"]}]')
+        console.print(f'\n[{STYLE_SUCCESS}]✓ DRY-RUN completado. No se han creado archivos.[/{STYLE_SUCCESS}]')
         return
 
     # ============================================================
@@ -189,38 +257,43 @@ def init(project_name, template, target, your_ip, force, dry_run, yes):
     try:
         project_path.mkdir(parents=True, exist_ok=True)
     except Exception as e:
-        console.print(f'[{THEME["error"]}]✗ Error al crear directorio del proyecto:[/{THEME["error"]}] {e}')
+        console.print(f'[{STYLE_ERROR}]✗ Error al crear directorio del proyecto:[/{STYLE_ERROR}] {e}')
         return
 
-    with console.status(f'[bold {THEME["primary"]}] Creando estructura...[/bold {THEME["primary"]}]', spinner="dots"):
+    # El spinner solo tiene sentido en una terminal; sin ella (CI, scripts,
+    # redirecciones) se evita arrancar el hilo de refresco de Rich.
+    if console.is_terminal:
+        status = console.status(f'[bold {STYLE_PRIMARY}] Creando estructura...[/bold {STYLE_PRIMARY}]', spinner="dots")
+    else:
+        status = nullcontext()
+
+    with status:
         create_structure(project_path, template_data.get('structure', []), variables)
         for file_info in template_data.get('global_files', []):
             create_file(project_path, file_info, variables)
 
     # ============================================================
-    # Mensaje de finalización
+    # Mensaje de finalización y árbol visual del proyecto
     # ============================================================
-    console.print()
-    console.print(
+    tree = Tree(f'[bold {STYLE_ACCENT}]{project_name}[/bold {STYLE_ACCENT}]', guide_style=STYLE_DIM)
+    build_tree(tree, project_path)
+
+    console.print(Group(
+        Text(),
         Panel.fit(
-            f'[{THEME["success"]}]✓ Proyecto creado exitosamente[/{THEME["success"]}]\n'
-            f'[{THEME["text"]}]Ubicación:[/{THEME["text"]}] [{THEME["secondary"]}]{project_path}[/{THEME["secondary"]}]',
-            title=f'[bold {THEME["accent"]}]Finalizado[/bold {THEME["accent"]}]',
-            border_style=THEME["border"],
-        )
-    )
+            f'[{STYLE_SUCCESS}]✓ Proyecto creado exitosamente[/{STYLE_SUCCESS}]\n'
+            f'[{STYLE_TEXT}]Ubicación:[/{STYLE_TEXT}] [{STYLE_SECONDARY}]{project_path}[/{STYLE_SECONDARY}]',
+            title=f'[bold {STYLE_ACCENT}]Finalizado[/bold {STYLE_ACCENT}]',
+            border_style=STYLE_BORDER,
+        ),
+        Text(),
+        tree,
+        Text(),
+        f'[{STYLE_SECONDARY}]->[/{STYLE_SECONDARY}] cd [bold {STYLE_ACCENT}]{project_name}[/bold {STYLE_ACCENT}]',
+        f'[{STYLE_SECONDARY}]->[/{STYLE_SECONDARY}] cat README.md\n',
+    ))
 
     # ============================================================
-    # Árbol visual del proyecto y metadatos
+    # Metadatos del proyecto
     # ============================================================
-    console.print()
-    tree = Tree(f'[bold {THEME["accent"]}]{project_name}[/bold {THEME["accent"]}]', guide_style=THEME['dim'])
-    build_tree(tree, project_path)
-    console.print(tree)
-
-    
-    console.print()
-    console.print(f'[{THEME["secondary"]}]->[/{THEME["secondary"]}] cd [bold {THEME["accent"]}]{project_name}[/bold {THEME["accent"]}]')
-    console.print(f'[{THEME["secondary"]}]->[/{THEME["secondary"]}] cat README.md\n')
-    
-    save_project_metadata(project_path, variables, template)
+    save_project_metadata(project_path, variables, template, created=now)
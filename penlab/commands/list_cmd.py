@@ -17,6 +17,7 @@ Ejemplo de uso:
 
 """
 
+import os
 import click
 from pathlib import Path
 from rich.console import Console
@@ -24,79 +25,153 @@ from rich.table import Table
 from rich import box
 import yaml
 
-from penlab.ui_theme import THEME
+from penlab.ui_theme import STYLE_SECONDARY, STYLE_INFO, STYLE_WARNING, STYLE_DIM, STYLE_SUCCESS
+from penlab.project import load_project_metadata, is_project_trash, PROJECT_META_FILE
 
 console = Console()
 
+# Claves de la metadata que muestra el listado.
+LIST_KEYS = ('name', 'template', 'target', 'created')
+
+# ============================================================
+# FUNCIÓN: _read_meta
+# ============================================================
+def _read_meta (path):
+    """
+    Lee el archivo `.penlab.yaml` de un posible proyecto.
+
+    No imprime nada: devuelve el aviso correspondiente para que
+    `list_projects` lo muestre en orden junto con el resto de resultados.
+
+    Args:
+        path (Path): Subdirectorio candidato a proyecto Penlab.
+
+    Returns:
+        tuple: `(proyecto, mensaje)`, donde `proyecto` es el diccionario con la
+        información resumida (o `None` si no es un proyecto legible) y `mensaje`
+        el aviso a mostrar (o `None`).
+    """
+    try:
+        # Sin `exists()` previo: si no hay metadatos, la lectura ya falla.
+        data = load_project_metadata(path, LIST_KEYS) or {}
+
+        if not isinstance(data, dict):
+            data = {}
+
+        return {
+            'name': data.get('name', path.name),
+            'template': data.get('template', 'N/A'),
+            'target': data.get('target', '-'),
+            'created': data.get('created', '-'),
+            'path': str(path)
+        }, None
+
+    except FileNotFoundError:
+        return None, None
+    except yaml.YAMLError:
+        return {
+            'name': path.name,
+            'template': 'N/A',
+            'target': '-',
+            'created': '-',
+            'path': str(path)
+        }, (
+            f'[{STYLE_WARNING}]⚠ Advertencia: Error al leer {path.name}/.penlab.yaml'
+            f'[/{STYLE_WARNING}]'
+        )
+    except Exception as e:
+        return None, (
+            f'[{STYLE_DIM}]⚠ No se pudo leer {path.name}/.penlab.yaml: {e}'
+            f'[/{STYLE_DIM}]'
+        )
+
+# ============================================================
+# FUNCIÓN: _find_candidates
+# ============================================================
+def _find_candidates (root, max_depth=0):
+    """
+    Devuelve los subdirectorios de `root` que pueden ser proyectos Penlab.
+
+    Recorre el árbol con `os.scandir` hasta `max_depth` niveles por debajo de
+    los hijos directos, sin descender dentro de los proyectos ya encontrados.
+    `DirEntry.is_dir()` usa el tipo que devuelve el propio listado, sin un
+    `stat` extra por entrada (salvo en enlaces simbólicos, que se siguen).
+
+    Args:
+        root (Path): Directorio desde el que buscar.
+        max_depth (int, opcional): Niveles adicionales a explorar. Por defecto 0
+            (solo los hijos directos).
+
+    Returns:
+        list[Path]: Directorios candidatos, en el orden del listado.
+    """
+    candidates = []
+    stack = [(root, 0)]
+
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            continue
+
+        with it:
+            for entry in it:
+                if not entry.is_dir() or is_project_trash(entry.name):
+                    continue
+
+                candidates.append(Path(entry.path))
+                if depth < max_depth and not os.path.exists(os.path.join(entry.path, PROJECT_META_FILE)):
+                    stack.append((entry.path, depth + 1))
+
+    return candidates
+
 # ============================================================
 # COMANDO: LIST-PROJECTS (listar proyectos Penlab)
 # ============================================================
 @click.command(name='list-projects')
-def list_projects():
+@click.option('--depth', '-d', default=0, type=click.IntRange(0, 5), help='Niveles de subdirectorios adicionales a explorar')
+def list_projects(depth):
     """
     Lista todos los proyectos Penlab en el directorio actual.
 
     Este comando escanea los subdirectorios del directorio actual en busca
     de proyectos Penlab válidos (aquellos que contienen un archivo `.penlab.yaml`).
+    Con `--depth` también explora subdirectorios anidados (por ejemplo, proyectos
+    agrupados por cliente), sin entrar en los proyectos encontrados.
     Luego muestra la información resumida de cada uno en una tabla formateada.
     Si no se encuentra ningún proyecto, se muestra un mensaje informativo.
 
     Ejemplo:
         $ penlab list-projects
+        $ penlab list-projects --depth 1
     """
     cwd = Path.cwd()
+
+    # Fase 1: candidatos (subdirectorios). Fase 2: lectura de los
+    # `.penlab.yaml`, en el orden de los candidatos.
     projects = []
 
-    for path in cwd.iterdir():
-        if path.is_dir() and (path / '.penlab.yaml').exists():
-            try:
-                with open(path / '.penlab.yaml', 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-
-                if not isinstance(data, dict):
-                    data = {}
-
-                projects.append({
-                    'name': data.get('name', path.name),
-                    'template': data.get('template', 'N/A'),
-                    'target': data.get('target', '-'),
-                    'created': data.get('created', '-'),
-                    'path': str(path)
-                })
-
-            except yaml.YAMLError as e:
-                console.print(
-                    f'[{THEME["warning"]}]⚠ Advertencia: Error al leer {path.name}/.penlab.yaml'
-                    f'[/{THEME["warning"]}]'
-                )
-                projects.append({
-                    'name': path.name,
-                    'template': 'N/A',
-                    'target': '-',
-                    'created': '-',
-                    'path': str(path)
-                })
-            except Exception as e:
-                console.print(
-                    f'[{THEME["dim"]}]⚠ No se pudo leer {path.name}/.penlab.yaml: {e}'
-                    f'[/{THEME["dim"]}]'
-                )
-                continue
+    for project, message in map(_read_meta, _find_candidates(cwd, depth)):
+        if message:
+            console.print(message)
+        if project is not None:
+            projects.append(project)
 
     if not projects:
-        console.print(f'[{THEME["warning"]}]No se encontraron proyectos Penlab en este directorio.')
+        console.print(f'[{STYLE_WARNING}]No se encontraron proyectos Penlab en este directorio.')
         return
 
     table = Table(
         box=box.SIMPLE, 
         show_header=True, 
-        header_style=f'bold {THEME["secondary"]}'
+        header_style=f'bold {STYLE_SECONDARY}'
     )
-    table.add_column('Proyecto', style=THEME['secondary'])
-    table.add_column('Template', style=THEME['success'])
-    table.add_column('Target', style=THEME['warning'])
-    table.add_column('Creado', style=THEME['info'])
-    table.add_column('Ruta', style=THEME['dim'])
+    table.add_column('Proyecto', style=STYLE_SECONDARY)
+    table.add_column('Template', style=STYLE_SUCCESS)
+    table.add_column('Target', style=STYLE_WARNING)
+    table.add_column('Creado', style=STYLE_INFO)
+    table.add_column('Ruta', style=STYLE_DIM)
 
     for p in projects:
         table.add_row(p['name'], p['template'], p['target'], p['created'], p['path'])
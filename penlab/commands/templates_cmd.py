@@ -28,11 +28,15 @@ from rich.table import Table
 from rich import box
 from rich.panel import Panel
 import yaml
-import shutil
 
 from penlab.config import ensure_penlab_structure, TEMPLATES_DIR
-from penlab.templates import load_template, validate_template
-from penlab.ui_theme import THEME
+from penlab.yaml_cache import drop_yaml_cache, yaml_cache_path, file_stamp, write_json_cache
+from penlab.templates import load_template, load_template_header, validate_template
+from penlab.ui_theme import (
+    STYLE_SECONDARY, STYLE_INFO, STYLE_WARNING, STYLE_ERROR, STYLE_DIM,
+    STYLE_BORDER, STYLE_ACCENT, STYLE_SUCCESS,
+)
+from penlab.yaml_fast import fast_load
 
 console = Console()
 
@@ -59,51 +63,59 @@ def list_templates ():
     Si no se encuentra ninguna plantilla instalada, se muestra una advertencia junto con
     la sugerencia de importar una nueva mediante `penlab templates import <archivo>`.
 
+    De cada plantilla solo se lee la cabecera, así que "Error al cargar" solo
+    aparece si el error está en esa parte: una plantilla con la cabecera válida
+    y un error más abajo se lista con normalidad (`templates show` o `init`
+    sí la rechazan).
+
     Ejemplo:
         $ penlab templates list
     """
     ensure_penlab_structure()
 
-    console.print(f'\n[{THEME["secondary"]}]Templates disponibles[/{THEME["secondary"]}]')
+    console.print(f'\n[{STYLE_SECONDARY}]Templates disponibles[/{STYLE_SECONDARY}]')
     
     template_files = list(TEMPLATES_DIR.glob('*.yaml'))
 
     if not template_files:
-        console.print(f'[{THEME["warning"]}] No hay templates instalados [/{THEME["warning"]}]')
-        console.print(f'[{THEME["dim"]}]Usa "penlab templates import <archivo>" para añadir templates[/{THEME["dim"]}]\n')
+        console.print(f'[{STYLE_WARNING}] No hay templates instalados [/{STYLE_WARNING}]')
+        console.print(f'[{STYLE_DIM}]Usa "penlab templates import <archivo>" para añadir templates[/{STYLE_DIM}]\n')
         return 
     
     table = Table(
         box=box.SIMPLE, 
         show_header=True, 
-        header_style=f'bold {THEME["accent"]}'
+        header_style=f'bold {STYLE_ACCENT}'
     )
-    table.add_column('Nombre', style=THEME['secondary'])
-    table.add_column('Versión', style=THEME['success'])
-    table.add_column('Descripción', style=THEME['info'], max_width=50)
-    table.add_column('Tags', style=THEME['warning'])
+    table.add_column('Nombre', style=STYLE_SECONDARY)
+    table.add_column('Versión', style=STYLE_SUCCESS)
+    table.add_column('Descripción', style=STYLE_INFO, max_width=50)
+    table.add_column('Tags', style=STYLE_WARNING)
 
     for template_file in template_files:
         try:
-            with open(template_file, 'r') as f:
-                data = yaml.safe_load(f) or {}
+            data = load_template_header(template_file) or {}
+        except (OSError, yaml.YAMLError):
+            data = None
 
-                name = str(data.get('name', template_file.stem))
-                version = str(data.get('version', '1.0'))
-                description = str(data.get('description', 'Sin descripción'))
+        if not isinstance(data, dict):
+            table.add_row(template_file.stem, '?', 'Error al cargar', '')
+            continue
 
-                tags_data = data.get('tags', [])
+        name = str(data.get('name', template_file.stem))
+        version = str(data.get('version', '1.0'))
+        description = str(data.get('description', 'Sin descripción'))
 
-                if isinstance(tags_data, (list, tuple)):
-                    tags = ', '.join(map(str, tags_data))
-                elif isinstance(tags_data, (str, int, float)):
-                    tags = str(tags_data)
-                else:
-                    tags = ''
+        tags_data = data.get('tags', [])
 
-                table.add_row(name, version, description, tags)
-        except:
-            table.add_row(template_file.stem, '?', 'Error al cargar', '')
+        if isinstance(tags_data, (list, tuple)):
+            tags = ', '.join(map(str, tags_data))
+        elif isinstance(tags_data, (str, int, float)):
+            tags = str(tags_data)
+        else:
+            tags = ''
+
+        table.add_row(name, version, description, tags)
 
     console.print(table)
     console.print()
@@ -136,19 +148,19 @@ def show_template (template_name):
     
     console.print()
     console.print(Panel.fit(
-        f'[bold {THEME["secondary"]}]{template_data.get("name", template_name)}[/bold {THEME["secondary"]}]\n'
-        f'[{THEME["dim"]}]Versión {template_data.get("version", 1.0)} | por {template_data.get("author", "Desconocido")}[/{THEME["dim"]}]\n\n'
+        f'[bold {STYLE_SECONDARY}]{template_data.get("name", template_name)}[/bold {STYLE_SECONDARY}]\n'
+        f'[{STYLE_DIM}]Versión {template_data.get("version", 1.0)} | por {template_data.get("author", "Desconocido")}[/{STYLE_DIM}]\n\n'
         f'{template_data.get("description", "Sin descripción")}\n\n'
-        f'[{THEME["warning"]}]Tags:[/{THEME["warning"]}] {", ".join(template_data.get("tags", []))}',
-        title=f'[{THEME["success"]}] Template info[/{THEME["success"]}]',
-        border_style=THEME["border"]
+        f'[{STYLE_WARNING}]Tags:[/{STYLE_WARNING}] {", ".join(template_data.get("tags", []))}',
+        title=f'[{STYLE_SUCCESS}] Template info[/{STYLE_SUCCESS}]',
+        border_style=STYLE_BORDER
     ))
 
     if 'variables' in template_data:
-        console.print(f'\n[{THEME["secondary"]}]Variables disponibles:[/{THEME["secondary"]}]')
+        console.print(f'\n[{STYLE_SECONDARY}]Variables disponibles:[/{STYLE_SECONDARY}]')
  
         for var, desc in template_data['variables'].items():
-            console.print(f' [{THEME["warning"]}]• {{{var}}}[/{THEME["warning"]}]: {desc}')
+            console.print(f' [{STYLE_WARNING}]• {{{var}}}[/{STYLE_WARNING}]: {desc}')
 
     console.print()
 
@@ -174,13 +186,15 @@ def import_template (file_path):
     ensure_penlab_structure()
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            template_data = yaml.safe_load(f) or {}
+        # El archivo se lee una sola vez: se validan y se instalan exactamente
+        # los mismos bytes.
+        raw = Path(file_path).read_bytes()
+        template_data = fast_load(raw) or {}
 
         valid, errors = validate_template(template_data)
 
         if not valid:
-            console.print(f'[{THEME["error"]}]✗ La template "{file_path}" no es válida. [{THEME["error"]}] Errores:')
+            console.print(f'[{STYLE_ERROR}]✗ La template "{file_path}" no es válida. [{STYLE_ERROR}] Errores:')
 
             for err in errors:
                 console.print(f'  - {err}')
@@ -190,10 +204,15 @@ def import_template (file_path):
         template_name = template_data.get('name', Path(file_path).stem)
         dest_path = TEMPLATES_DIR / f'{template_name}.yaml'
 
-        shutil.copy(file_path, dest_path)
+        dest_path.write_bytes(raw)
+
+        # Ya tenemos los datos parseados: se deja preparado el caché JSON para
+        # que el primer `templates list`/`init` no tenga que volver a parsear.
+        drop_yaml_cache(dest_path)
+        write_json_cache(yaml_cache_path(dest_path), file_stamp(dest_path), template_data)
 
-        console.print(f'\n[{THEME["success"]}]✓[/{THEME["success"]}] Template "{template_name}" importado correctamente')
-        console.print(f'[{THEME["dim"]}]Ubicación: {dest_path}[/{THEME["dim"]}]\n')
+        console.print(f'\n[{STYLE_SUCCESS}]✓[/{STYLE_SUCCESS}] Template "{template_name}" importado correctamente')
+        console.print(f'[{STYLE_DIM}]Ubicación: {dest_path}[/{STYLE_DIM}]\n')
 
     except Exception as e:
-        console.print(f'\n[{THEME["error"]}]✗[/{THEME["error"]}] Error al importar la template: {e}\n')
\ No newline at end of file
+        console.print(f'\n[{STYLE_ERROR}]✗[/{STYLE_ERROR}] Error al importar la template: {e}\n')
\ No newline at end of file
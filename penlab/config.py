@@ -6,9 +6,11 @@ Agrupa funciones y constantes de configuración de la herramienta Penlab.
 
 """
 import os
-import yaml
 from pathlib import Path
 
+from penlab.yaml_fast import fast_dump
+from penlab.yaml_cache import load_yaml_cached, drop_yaml_cache
+
 # Configuración de paths.
 PENLAB_HOME = Path.home() / '.penlab'
 TEMPLATES_DIR = PENLAB_HOME / 'templates'
@@ -24,20 +26,38 @@ DEFAULT_CONFIG = {
     'default_template': 'default'
 }
 
+# Indica si la estructura ya se comprobó en este proceso.
+_structure_ready = False
+
 def ensure_penlab_structure ():
     """
     Asegura que los directorios básicos y el archivo de configuración global
     de Penlab esten creados. Si no lo están, los crea.
+
+    Solo hace la comprobación la primera vez que se llama en cada proceso.
     """
-    PENLAB_HOME.mkdir(exist_ok=True)
-    TEMPLATES_DIR.mkdir(exist_ok=True)
+    global _structure_ready
+
+    if _structure_ready:
+        return
+
+    # Un único listado del directorio de templates dice qué plantillas faltan
+    # (en lugar de un `stat` por plantilla) y, si el directorio ya existe,
+    # ahorra también los `mkdir`.
+    try:
+        with os.scandir(TEMPLATES_DIR) as entries:
+            existing = {entry.name for entry in entries}
+    except FileNotFoundError:
+        PENLAB_HOME.mkdir(exist_ok=True)
+        TEMPLATES_DIR.mkdir(exist_ok=True)
+        existing = set()
 
     if not CONFIG_FILE.exists():
-        with open(CONFIG_FILE, 'w') as f:
-            yaml.dump(DEFAULT_CONFIG, f)
+        with open(CONFIG_FILE, 'wb') as f:
+            fast_dump(DEFAULT_CONFIG, f)
 
     # --- Plantilla 'default' ---
-    if not DEFAULT_TEMPLATE_FILE.exists(): 
+    if DEFAULT_TEMPLATE_FILE.name not in existing:
         default_template = {
             "name": "default",
             "version": "1.0",
@@ -67,11 +87,11 @@ def ensure_penlab_structure ():
             ]
         }   
 
-        with open(DEFAULT_TEMPLATE_FILE, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(default_template, f, sort_keys=False, allow_unicode=True)
+        with open(DEFAULT_TEMPLATE_FILE, 'wb') as f:
+            fast_dump(default_template, f)
             
     # --- Plantilla 'htb' ---
-    if not HTB_TEMPLATE_FILE.exists():
+    if HTB_TEMPLATE_FILE.name not in existing:
         htb_template = {
             "name": "htb",
             "version": "1.0",
@@ -215,8 +235,10 @@ def ensure_penlab_structure ():
             ]
         }
         
-        with open(HTB_TEMPLATE_FILE, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(htb_template, f, sort_keys=False, allow_unicode=True)
+        with open(HTB_TEMPLATE_FILE, 'wb') as f:
+            fast_dump(htb_template, f)
+
+    _structure_ready = True
 
 
 def load_config ():
@@ -224,14 +246,17 @@ def load_config ():
     Se asegura de que toda la estructura básica de directorios y archivos esté
     creada y luego carga la configuración del archivo definido en `CONFIG_FILE`.
     En caso de que algo falle, devuelve la configuración por defecto. 
+
+    La lectura pasa por `load_yaml_cached()`, que devuelve una copia: el
+    llamante puede modificarla libremente. `save_config()` invalida el caché
+    tras escribir.
     """
     ensure_penlab_structure()
 
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            return yaml.safe_load(f) or DEFAULT_CONFIG
+        return load_yaml_cached(CONFIG_FILE) or dict(DEFAULT_CONFIG)
     except:
-        return DEFAULT_CONFIG
+        return dict(DEFAULT_CONFIG)
     
 def save_config (config):
     """
@@ -241,5 +266,7 @@ def save_config (config):
     Args:
         config (str): Configuración a guardar globalmente.
     """
-    with open(CONFIG_FILE, 'w') as f:
-        yaml.dump(config, f)
\ No newline at end of file
+    with open(CONFIG_FILE, 'wb') as f:
+        fast_dump(config, f)
+
+    drop_yaml_cache(CONFIG_FILE)
\ No newline at end of file
@@ -6,7 +6,7 @@ import json
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass, asdict
 from rich.console import Console
 from rich.table import Table
@@ -14,6 +14,15 @@ from rich.panel import Panel
 from rich import box
 import click
 
+from penlab.project import load_project_metadata, PROJECT_META_FILE
+
+# `orjson` (opcional) es bastante más rápido que `json` y serializa las
+# dataclasses directamente; si no está instalado se usa `json`.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 console = Console()
 
 @dataclass
@@ -32,41 +41,49 @@ class ProjectNotFound (Exception):
     """ Excepción cuando no se encuentra un proyecto Penlab """
     pass
 
+# Raíces de proyecto ya encontradas, por directorio de partida. Solo se
+# memorizan los aciertos: un "no encontrado" puede dejar de serlo en cuanto
+# se crea un proyecto, pero un proyecto no desaparece durante el proceso.
+_project_roots = {}
+
 def find_project_root (start_path: Path = None) -> Optional[Path]:
     """ Busca el directorio raíz del proyecto Penlab. Lo hace subiendo
         recursivamente sobre los directorios hasta encontrar .penlab.yaml
     """
-    if start_path is None:
-        start_path = Path.cwd()
+    key = os.getcwd() if start_path is None else os.path.abspath(start_path)
 
-    current = start_path.absolute()
+    root = _project_roots.get(key)
+    if root is not None:
+        return root
 
-    while current != current.parent:
-        penlab_file = current / '.penlab.yaml'
+    # Se trabaja con cadenas y un único `os.stat` por nivel, sin crear
+    # objetos `Path` intermedios.
+    current, parent = key, os.path.dirname(key)
 
-        if penlab_file.exists():
-            return current
-        
-        current = current.parent
+    while current != parent:
+        try:
+            os.stat(os.path.join(current, PROJECT_META_FILE))
+        except (FileNotFoundError, NotADirectoryError):
+            current, parent = parent, os.path.dirname(parent)
+            continue
+
+        root = _project_roots[key] = Path(current)
+        return root
 
     return None
 
 def get_project_info (project_root: Path) -> Dict:
     """ Lee la información del proyecto en el archivo .penlab.yaml """
-    import yaml
-
-    penlab_file = project_root / '.penlab.yaml'
-
-    if not penlab_file.exists():
+    # Sin comprobar antes si existe: la lectura ya falla con
+    # `FileNotFoundError` si no hay `.penlab.yaml`.
+    try:
+        return load_project_metadata(project_root)
+    except FileNotFoundError:
         return {
             'name': project_root.name,
             'target': 'unknown',
             'created': datetime.now().isoformat()
         }
-    
-    try:
-        with open(penlab_file, 'r') as f:
-            return yaml.safe_load(f)
     except:
         return {
             'name': project_root.name
@@ -79,42 +96,54 @@ def get_notes_file (project_root: Path) -> Path:
 
     return penlab_dir / 'notes.json'
 
-def load_notes (notes_file: Path) -> List[Note]:
-    """ Carga las notas desde el archivo JSON """
+def load_notes (notes_file: Path) -> Tuple[int, Dict[int, Note]]:
+    """ Carga las notas desde el archivo JSON.
+
+        Devuelve el siguiente ID libre y las notas indexadas por ID. Acepta
+        también el formato antiguo (una lista de notas).
+    """
     if not notes_file.exists():
-        return []
+        return 1, {}
     
     try:
-        with open(notes_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-            return [Note(**note) for note in data]
+        raw = notes_file.read_bytes()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+
+        if isinstance(data, list):
+            notes = {note['id']: Note(**note) for note in data}
+            return max(notes, default=0) + 1, notes
+
+        notes = {int(note_id): Note(**note) for note_id, note in data['notes'].items()}
+        return data['next_id'], notes
     except Exception as e:
         console.print(f'[red]Error al cargar notas: [/red] {e}')
         
-        return []
+        return 1, {}
     
-def save_notes (notes_file: Path, notes: List[Note]):
+def save_notes (notes_file: Path, next_id: int, notes: Dict[int, Note]):
     """ Guarda las notas en el archivo JSON """
     try:
-        with open(notes_file, 'w', encoding='utf-8') as f:
-            json.dump([note.to_dict() for note in notes], f, indent=4, ensure_ascii=False)
+        if orjson:
+            data = {'next_id': next_id, 'notes': {str(note_id): note for note_id, note in notes.items()}}
+            notes_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            data = {'next_id': next_id, 'notes': {str(note_id): note.to_dict() for note_id, note in notes.items()}}
+            with open(notes_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
     except Exception as e:
         console.print(f'[red]Error al guardar notas: [/red] {e}')
 
 def add_note (project_root: Path, content: str, tags: List[str], author: str):
     notes_file = get_notes_file(project_root)
-    notes = load_notes(notes_file)
-    new_id = max([note.id for note in notes], default=0) + 1
-    note = Note(id=new_id, content=content, tags=tags, author=author, timestamp=datetime.now().isoformat)
-    notes.append(note)
-    save_notes(notes_file, notes)
+    new_id, notes = load_notes(notes_file)
+    notes[new_id] = Note(id=new_id, content=content, tags=tags, author=author, timestamp=datetime.now().isoformat())
+    save_notes(notes_file, new_id + 1, notes)
 
     console.print(f'[green]Nota {new_id} añadida correctamente. [/green]')
 
 def list_notes (project_root: Path):
     notes_file = get_notes_file(project_root)
-    notes = load_notes(notes_file)
+    _, notes = load_notes(notes_file)
 
     if not notes:
         console.print('[yellow]No hay notas aún para este proyecto.[/yellow]')
@@ -125,41 +154,40 @@ def list_notes (project_root: Path):
     table.add_column("Fecha", style="green", width=20)
     table.add_column("Tags", style="yellow", width=20)
     table.add_column("Contenido", style="white", max_width=60, overflow="fold")
-    for note in notes:
+    for note in notes.values():
         table.add_row(str(note.id), note.timestamp.split("T")[0], ", ".join(note.tags), note.content[:120])
     console.print(table)
 
 def view_note (project_root: Path, note_id: int):
     notes_file = get_notes_file(project_root)
-    notes = load_notes(notes_file)
-    for note in notes:
-        if note.id == note_id:
-            panel = Panel.fit(
-                f"[bold cyan]Autor:[/bold cyan] {note.author}\n"
-                f"[bold cyan]Fecha:[/bold cyan] {note.timestamp}\n"
-                f"[bold cyan]Tags:[/bold cyan] {', '.join(note.tags)}\n\n"
-                f"[white]{note.content}[/white]",
-                title=f"Nota #{note.id}",
-                border_style="magenta"
-            )
-            console.print(panel)
-            return
+    _, notes = load_notes(notes_file)
+    note = notes.get(note_id)
+    if note is not None:
+        panel = Panel.fit(
+            f"[bold cyan]Autor:[/bold cyan] {note.author}\n"
+            f"[bold cyan]Fecha:[/bold cyan] {note.timestamp}\n"
+            f"[bold cyan]Tags:[/bold cyan] {', '.join(note.tags)}\n\n"
+            f"[white]{note.content}[/white]",
+            title=f"Nota #{note.id}",
+            border_style="magenta"
+        )
+        console.print(panel)
+        return
     console.print(f"[red]✗[/red] No se encontró la nota con ID {note_id}.")
 
 def delete_note(project_root: Path, note_id: int):
     notes_file = get_notes_file(project_root)
-    notes = load_notes(notes_file)
-    new_notes = [n for n in notes if n.id != note_id]
-    if len(new_notes) == len(notes):
+    next_id, notes = load_notes(notes_file)
+    if notes.pop(note_id, None) is None:
         console.print(f"[red]✗[/red] No se encontró la nota con ID {note_id}.")
         return
-    save_notes(notes_file, new_notes)
+    save_notes(notes_file, next_id, notes)
     console.print(f"[green]✓[/green] Nota #{note_id} eliminada correctamente.")
 
 def search_notes(project_root: Path, keyword: str):
     notes_file = get_notes_file(project_root)
-    notes = load_notes(notes_file)
-    results = [n for n in notes if keyword.lower() in n.content.lower() or any(keyword.lower() in t.lower() for t in n.tags)]
+    _, notes = load_notes(notes_file)
+    results = [n for n in notes.values() if keyword.lower() in n.content.lower() or any(keyword.lower() in t.lower() for t in n.tags)]
     if not results:
         console.print(f"[yellow]No se encontraron notas que contengan '{keyword}'.[/yellow]")
         return
@@ -7,21 +7,69 @@ Funciones para la creación y gestión de proyectos Penlab.
 Este módulo contiene las funciones encargadas de:
 - Generar la estructura de directorios y archivos de un proyecto a partir de una *template*.
 - Crear archivos individuales reemplazando variables dinámicas.
-- Guardar la metadata del proyecto en el archivo `.penlab.yaml`.
+- Guardar y leer la metadata del proyecto en el archivo `.penlab.yaml`.
 
 Estas funciones son utilizadas principalmente por el comando:
     `penlab init <project-name>`
 """
 import os
-import yaml
+import re
+import json
+import uuid
 from pathlib import Path
 from rich.console import Console
 from datetime import datetime
 
-from penlab.utils import sanitize_name, is_within_directory
+from penlab.utils import sanitize_name, resolve_child, substitute_variables
+from penlab.yaml_fast import fast_load, fast_dump, load_header
+from penlab.yaml_cache import file_stamp, read_json_cache, write_json_cache
 
 console = Console()
 
+# `O_NOFOLLOW` y `O_DIRECTORY` no existen en Windows, donde tampoco se
+# puede abrir un archivo relativo a un directorio (`dir_fd`) ni cambiar sus
+# permisos de ejecución.
+O_NOFOLLOW = getattr(os, 'O_NOFOLLOW', 0)
+O_DIRECTORY = getattr(os, 'O_DIRECTORY', 0)
+DIR_FD_SUPPORTED = os.open in os.supports_dir_fd
+FCHMOD_SUPPORTED = os.name == 'posix'
+
+# Archivo de metadata de un proyecto y su copia en JSON.
+PROJECT_META_FILE = '.penlab.yaml'
+PROJECT_META_CACHE = '.penlab.json'
+
+# Sufijo de los directorios en los que `init --force` aparta un proyecto
+# antes de borrarlo (`<nombre>.trash-<8 hex>`, ver `project_trash_name()`).
+PROJECT_TRASH_SUFFIX = '.trash-'
+_PROJECT_TRASH_REGEX = re.compile(re.escape(PROJECT_TRASH_SUFFIX) + r'[0-9a-f]{8}$')
+
+# Plantilla de `.penlab.yaml`: las claves son fijas, así que no hace falta
+# pasar por el emisor de YAML (ver `_yaml_quote()`).
+META_TEMPLATE = (
+    'name: {name}\n'
+    'template: {template}\n'
+    'target: {target}\n'
+    'your-ip: {your_ip}\n'
+    'author: {author}\n'
+    'created: {created}\n'
+    'path: {path}\n'
+)
+
+# ============================================================
+# FUNCIÓN: project_trash_name / is_project_trash
+# ============================================================
+def project_trash_name (name: str) -> str:
+    """ Devuelve el nombre con el que se aparta el proyecto `name` antes de borrarlo. """
+    return f'{name}{PROJECT_TRASH_SUFFIX}{uuid.uuid4().hex[:8]}'
+
+def is_project_trash (name: str) -> bool:
+    """
+    Indica si `name` es un directorio apartado por `project_trash_name()`.
+    No es un proyecto aunque conserve su `.penlab.yaml` mientras se borra
+    (o si el borrado falla).
+    """
+    return _PROJECT_TRASH_REGEX.search(name) is not None
+
 # ============================================================
 # FUNCIÓN: create_structure
 # ============================================================
@@ -29,12 +77,15 @@ def create_structure (base_path: Path, structure, variables):
     """
     Crea la estructura de directorios y archivos de un proyecto Penlab.
 
-    Recorre recursivamente la estructura definida en la plantilla YAML
-    y genera los directorios y archivos correspondientes.  
+    Recorre la estructura definida en la plantilla YAML una sola vez para
+    reunir todos los directorios y archivos. Después crea cada directorio
+    una única vez, ordenados por profundidad (el padre siempre existe antes
+    que el hijo), y por último escribe los archivos en el orden de la
+    template: si dos entradas apuntan al mismo archivo, se conserva la última.  
     Evita que las rutas escapen del directorio base del proyecto.
 
     Args:
-        base_path (Path): Ruta raíz del proyecto.
+        base_path (Path): Ruta raíz del proyecto (debe existir).
         structure (list): Lista de diccionarios con la definición de carpetas.
         variables (dict): Variables dinámicas (por ejemplo, {project-name}, {author}).
 
@@ -47,10 +98,67 @@ def create_structure (base_path: Path, structure, variables):
             }
         ]
     """
+    dirs, files = [], []
+    _collect_structure(base_path, structure, variables, dirs, files)
+
+    failed = set()
+
+    for dir_path in sorted(dict.fromkeys(dirs), key=lambda p: len(p.parts)):
+        # Si el padre no se pudo crear, el hijo tampoco (el error ya se mostró).
+        if dir_path.parent in failed:
+            failed.add(dir_path)
+            continue
+
+        try:
+            dir_path.mkdir(exist_ok=True)
+        except Exception as e:
+            console.print(f'[red]✗[/red] No se pudo crear la carpeta {dir_path}: {e}')
+            failed.add(dir_path)
+
+    jobs = [(dir_path, file_info) for dir_path, file_info in files if dir_path not in failed]
+
+    if not jobs:
+        return
+
+    # Cada directorio se abre una sola vez y sus archivos se crean relativos
+    # a él (`dir_fd`): el kernel solo resuelve el último componente de la
+    # ruta en lugar de recorrerla entera para cada archivo.
+    dir_fds = {}
+
+    try:
+        if DIR_FD_SUPPORTED:
+            for dir_path, _ in jobs:
+                if dir_path not in dir_fds:
+                    try:
+                        dir_fds[dir_path] = os.open(dir_path, os.O_RDONLY | O_DIRECTORY)
+                    except OSError:
+                        dir_fds[dir_path] = None
+
+        for dir_path, file_info in jobs:
+            create_file(dir_path, file_info, variables, dir_fds.get(dir_path))
+    finally:
+        for fd in dir_fds.values():
+            if fd is not None:
+                os.close(fd)
+
+def _collect_structure (base_path: Path, structure, variables, dirs, files):
+    """
+    Recorre la estructura de la template sin tocar el disco, acumulando en
+    `dirs` las rutas de los directorios y en `files` los pares
+    `(directorio, file_info)`.
+
+    Usa una pila explícita en lugar de recursión y respeta el orden de la
+    template: cada directorio aparece antes que sus subdirectorios.
+    """
     if not isinstance(structure, (list, tuple)):
         return
-    
-    for item in structure:
+
+    base_resolved = base_path.resolve()
+    stack = [(base_path, base_resolved, item) for item in reversed(structure)]
+
+    while stack:
+        base_path, parent_resolved, item = stack.pop()
+
         if not isinstance(item, dict):
             continue
         raw_dir = item.get('dir')
@@ -58,35 +166,31 @@ def create_structure (base_path: Path, structure, variables):
         if not raw_dir:
             continue
 
-        dir_name = str(raw_dir)
-
-        for var, val in variables.items():
-            dir_name = dir_name.replace(f'{{{var}}}', val)
-
+        dir_name = substitute_variables(str(raw_dir), variables)
         dir_name = sanitize_name(dir_name, replace_with='-')
         dir_path = base_path / dir_name
 
-        if not is_within_directory(base_path, dir_path):
+        # La ruta resuelta se reutiliza como base de los subdirectorios: así
+        # cada nodo solo comprueba su propio nombre (ver `resolve_child()`).
+        dir_resolved = resolve_child(parent_resolved, dir_name)
+        if dir_resolved is None:
             console.print(f'[red]✗[/red] Ruta inválida en template (intentando salir de {base_path}): {dir_path}')
             continue
 
-        try:
-            dir_path.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            console.print(f'[red]✗[/red] No se pudo crear la carpeta {dir_path}: {e}')
-            continue
-
-        if 'subdirs' in item:
-            create_structure(dir_path, item.get('subdirs', []), variables)
+        dirs.append(dir_path)
 
         if 'files' in item:
             for file_info in item.get('files', []):
-                create_file(dir_path, file_info, variables)
+                files.append((dir_path, file_info))
+
+        subdirs = item.get('subdirs')
+        if isinstance(subdirs, (list, tuple)) and subdirs:
+            stack.extend((dir_path, dir_resolved, sub) for sub in reversed(subdirs))
 
 # ============================================================
 # FUNCIÓN: create_file
 # ============================================================
-def create_file (path: Path, file_info, variables):
+def create_file (path: Path, file_info, variables, dir_fd=None):
     """
     Crea un archivo en la ruta indicada y escribe contenido dinámico opcional.
 
@@ -94,6 +198,8 @@ def create_file (path: Path, file_info, variables):
         path (Path): Directorio donde se creará el archivo.
         file_info (dict): Información del archivo (nombre, contenido, permisos).
         variables (dict): Variables que serán sustituidas en nombre y contenido.
+        dir_fd (int, opcional): Descriptor ya abierto de `path`; si se indica,
+            el archivo se abre relativo a él.
     """
     if not isinstance(file_info, dict):
         return
@@ -103,44 +209,55 @@ def create_file (path: Path, file_info, variables):
     if not raw_name:
         return
     
-    name = str(raw_name)
-
-    for var, val in variables.items():
-        name = name.replace(f'{{{var}}}', val)
-
+    name = substitute_variables(str(raw_name), variables)
     name = sanitize_name(name, replace_with='_')
     file_path = path / name
 
-    # Verificar que el archivo final esté dentro del proyecto
-    if not is_within_directory(path.parent.resolve(), file_path.resolve() if file_path.exists() else path.resolve()):
+    # `sanitize_name` ya eliminó los separadores, así que el nombre es un único
+    # componente y el directorio ya se validó al recorrer la estructura: basta
+    # con descartar "." y "..". Un enlace simbólico en el propio archivo se
+    # rechaza al abrirlo (`O_NOFOLLOW`), sin resolver rutas.
+    if name in ('.', '..'):
         console.print(f'[red]✗[/red] Ruta de archivo inválida: {file_path}')
         return
     
-    content = file_info.get('content', '')
+    content = substitute_variables(file_info.get('content', ''), variables)
 
-    for var, value in variables.items():
-        content = content.replace(f'{{{var}}}', str(value))
+    data = content.encode('utf-8')
 
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Mismos permisos que `open()`: 0o666 filtrado por la umask.
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_NOFOLLOW
+
+        if dir_fd is not None and name:
+            fd = os.open(name, flags, 0o666, dir_fd=dir_fd)
+        else:
+            fd = os.open(file_path, flags, 0o666)
+        try:
+            # Los ejecutables se fijan a 0o755 de forma explícita: el modo de
+            # `os.open` pasa por la umask y no se aplica si el archivo ya existía.
+            if file_info.get('executable', False) and FCHMOD_SUPPORTED:
+                try:
+                    os.fchmod(fd, 0o755)
+                except OSError:
+                    pass
+
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
     except Exception as e:
         console.print(f'[red]✗[/red] Error escribiendo archivo {file_path}: {e}')
         return
-    
-    if file_info.get('executable', False):
-        try:
-            if os.name == 'posix':
-                file_path.chmod(0o755)
-        except Exception:
-            pass
 
 # ============================================================
 # FUNCIÓN: save_project_metadata
 # ============================================================
-def save_project_metadata (project_path: Path, variables: dict, template_name: str):
+def save_project_metadata (project_path: Path, variables: dict, template_name: str, created: datetime = None):
     """
-    Guarda la metadata básica del proyecto en `.penlab.yaml`.
+    Guarda la metadata básica del proyecto en `.penlab.yaml` (y una copia
+    en `.penlab.json` para acelerar las lecturas posteriores).
 
     Este archivo almacena la información esencial del proyecto:
     nombre, plantilla usada, IPs, autor, fecha de creación y ruta.
@@ -149,6 +266,7 @@ def save_project_metadata (project_path: Path, variables: dict, template_name: s
         project_path (Path): Ruta del proyecto.
         variables (dict): Variables del proyecto (nombre, autor, etc.).
         template_name (str): Nombre de la plantilla utilizada.
+        created (datetime, opcional): Instante de creación; por defecto, ahora.
     """
     metadata = {
         'name': variables.get('project-name'),
@@ -156,16 +274,78 @@ def save_project_metadata (project_path: Path, variables: dict, template_name: s
         'target': variables.get('target'),
         'your-ip': variables.get('your-ip'),
         'author': variables.get('author'),
-        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'created': (created or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
         'path': str(project_path.resolve())
     }
 
-    meta_path = project_path / '.penlab.yaml'
+    meta_path = project_path / PROJECT_META_FILE
 
     try:
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(metadata, f, allow_unicode=True)
+        quoted = {key.replace('-', '_'): _yaml_quote(value) for key, value in metadata.items()}
+
+        if None in quoted.values():
+            # Algún valor no es un texto simple: se usa el emisor de YAML.
+            with open(meta_path, 'wb') as f:
+                fast_dump(metadata, f)
+        else:
+            meta_path.write_bytes(META_TEMPLATE.format(**quoted).encode('utf-8'))
+
+        # Copia en JSON para `list-projects`/`info`; el YAML sigue siendo la
+        # fuente de verdad y el JSON solo se usa mientras su marca coincida.
+        write_json_cache(project_path / PROJECT_META_CACHE, file_stamp(meta_path), metadata)
 
         console.print(f'[dim]→ Metadata guardada en {meta_path}[/dim]')
     except Exception as e:
-        console.print(f'[red]✗ Error guardando metadata del proyecto:[/red] {e}')
\ No newline at end of file
+        console.print(f'[red]✗ Error guardando metadata del proyecto:[/red] {e}')
+
+def _yaml_quote (value):
+    """
+    Devuelve `value` como escalar YAML entre comillas dobles, o `None` si no
+    se puede escribir de forma segura sin el emisor de YAML.
+
+    Una cadena JSON es también un escalar YAML válido (`"` y `\\` escapados).
+    Solo se aceptan textos imprimibles: los saltos de línea, tabuladores o
+    separadores Unicode (p. ej. U+2028) YAML los trataría como espacios.
+    `None` se escribe como `null`, igual que lo haría `yaml.safe_dump`.
+    """
+    if value is None:
+        return 'null'
+
+    if isinstance(value, str) and value.isprintable():
+        return json.dumps(value, ensure_ascii=False)
+
+    return None
+
+# ============================================================
+# FUNCIÓN: load_project_metadata
+# ============================================================
+def load_project_metadata (project_path: Path, keys=None):
+    """
+    Carga la metadata de un proyecto Penlab.
+
+    Usa `.penlab.json` si su marca coincide con la del `.penlab.yaml` actual;
+    si falta o está desactualizado (p. ej. el YAML se editó a mano), parsea
+    el YAML. Si se indican `keys`, del YAML se leen solo esas claves
+    (ver `load_header()`).
+
+    Args:
+        project_path (Path): Ruta del proyecto.
+        keys (tuple, opcional): Claves necesarias; por defecto, todas.
+
+    Returns:
+        La metadata del proyecto (o `None` si el archivo está vacío).
+
+    Raises:
+        FileNotFoundError: Si el proyecto no tiene `.penlab.yaml`.
+        yaml.YAMLError: Si el YAML está mal formado.
+    """
+    meta_path = project_path / PROJECT_META_FILE
+
+    hit, data = read_json_cache(project_path / PROJECT_META_CACHE, file_stamp(meta_path))
+    if hit:
+        return data
+
+    if keys:
+        return load_header(meta_path, keys)
+
+    return fast_load(meta_path.read_bytes())
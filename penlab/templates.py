@@ -9,13 +9,22 @@ usadas por Penlab para crear proyectos automáticamente.
 Cada template está escrita en formato **YAML** y define la estructura de carpetas,
 archivos y variables necesarias para inicializar un nuevo proyecto.
 """
-import yaml
 from rich.console import Console
 
 from penlab.config import TEMPLATES_DIR
+from penlab.yaml_cache import load_yaml_cached, yaml_cache_path, file_stamp, read_json_cache
+from penlab.yaml_fast import load_header
 
 console = Console()
 
+# Claves de cabecera que se muestran en `penlab templates list`.
+HEADER_KEYS = ('name', 'version', 'description', 'tags')
+
+# Tipos aceptados por `validate_template()`, creados una sola vez en lugar
+# de construir la tupla en cada `isinstance`.
+_SCALAR = (str, int, float)
+_LISTLIKE = (list, tuple)
+
 # ============================================================
 # FUNCIÓN: validate_template
 # ============================================================
@@ -53,10 +62,10 @@ def validate_template (template_data):
         return False, ['La template debe ser un mapping/dict en el YAML (nivel superior).']
     
     # Top-level basics
-    if 'name' in template_data and not isinstance(template_data['name'], (str, int, float)):
+    if 'name' in template_data and not isinstance(template_data['name'], _SCALAR):
         errors.append('El campo "name" debe ser un texto (string).')
 
-    if 'version' in template_data and not isinstance(template_data['version'], (str, int, float)):
+    if 'version' in template_data and not isinstance(template_data['version'], _SCALAR):
         errors.append('El campo "version" debe ser un texto o un número.')
 
     if 'description' in template_data and not isinstance(template_data['description'], str):
@@ -65,11 +74,11 @@ def validate_template (template_data):
     if 'tags' in template_data:
         tags = template_data['tags']
 
-        if not isinstance(tags, (list, tuple, str, int, float)):
+        if not isinstance(tags, _LISTLIKE + _SCALAR):
             errors.append('el campo "tags" debe ser una lista de strings o un string/number suelto.')
-        elif isinstance(tags, (list, tuple)):
+        elif isinstance(tags, _LISTLIKE):
             for i, t in enumerate(tags):
-                if not isinstance(t, (str, int, float)):
+                if not isinstance(t, _SCALAR):
                     errors.append(f'Tag en posición {i} no es un texto/num válido.')
     
     if 'variables' in template_data and not isinstance(template_data['variables'], dict):
@@ -78,7 +87,7 @@ def validate_template (template_data):
     if 'structure' in template_data:
         structure = template_data['structure']
 
-        if not isinstance(structure, (list, tuple)):
+        if not isinstance(structure, _LISTLIKE):
             errors.append('El campo "structure" debe ser una lista.')
         else:
             for idx, item in enumerate(structure):
@@ -89,56 +98,63 @@ def validate_template (template_data):
                 if 'dir' not in item:
                     errors.append(f'structure[{idx}] falta la clave "dir".')
                 else:
-                    if not isinstance(item['dir'], (str, int, float)):
+                    if not isinstance(item['dir'], _SCALAR):
                         errors.append(f'structure[{idx}].dir debe ser un texto.')
                 
-                if 'subdirs' in item and not isinstance(item['subdirs'], (list, tuple)):
+                if 'subdirs' in item and not isinstance(item['subdirs'], _LISTLIKE):
                     errors.append(f'structure[{idx}].subdirs debe ser una lista.')
 
                 if 'files' in item:
-                    if not isinstance(item['files'], (list, tuple)):
+                    if not isinstance(item['files'], _LISTLIKE):
                         errors.append(f'structure[{idx}].files debe ser una lista.')
                     else:
                         for j, f in enumerate(item['files']):
                             if not isinstance(f, dict):
                                 errors.append(f'structure[{idx}].files[{j}] debe ser un mapping/dict.')
                                 continue
-                            if 'name' not in f:
-                                errors.append(f'structure[{idx}].files[{j}] falta "name"')
-                            else:
-                                if not isinstance(f['name'], (str, int, float)):
-                                    errors.append(f"structure[{idx}].files[{j}].name debe ser texto.")
-                            if 'content' in f and not isinstance(f['content'], str):
-                                errors.append(f"structure[{idx}].files[{j}].content debe ser texto.")
-                            if 'executable' in f and not isinstance(f['executable'], bool):
-                                errors.append(f"structure[{idx}].files[{j}].executable debe ser booleano (true/false).")
+                            _validate_file(f, errors, 'structure[{}].files[{}]', idx, j)
 
     if 'global_files' in template_data:
         gf = template_data['global_files']
 
-        if not isinstance(gf, (list, tuple)):
+        if not isinstance(gf, _LISTLIKE):
             errors.append('El campo "global_files" debe ser una lista.')
         else:
             for i, f in enumerate(gf):
                 if not isinstance(f, dict):
                     errors.append(f'global_files[{i}] debe ser una mapping/dict.')
                     continue
-                if 'name' not in f:
-                    errors.append(f'global_files[{i}] falta "name"')
-                else:
-                    if not isinstance(f['name'], (str, int, float)):
-                        errors.append(f'global_files[{i}].name debe ser texto.')
-                
-                if 'content' in f and not isinstance(f['content'], str):
-                    errors.append(f"global_files[{i}].content debe ser texto.")
-                if 'executable' in f and not isinstance(f['executable'], bool):
-                    errors.append(f"global_files[{i}].executable debe ser booleano (true/false).")
+                _validate_file(f, errors, 'global_files[{}]', i)
 
     if errors:
         return False, errors
     
     return True, []
 
+def _validate_file (file_data: dict, errors: list, location: str, *indices):
+    """
+    Comprueba un archivo de la template (`name`, `content`, `executable`),
+    tanto de `structure[].files` como de `global_files`.
+
+    La ubicación del archivo para los mensajes (`location.format(*indices)`)
+    solo se construye si hay algún error.
+    """
+    problems = []
+
+    if 'name' not in file_data:
+        problems.append(' falta "name"')
+    elif not isinstance(file_data['name'], _SCALAR):
+        problems.append('.name debe ser texto.')
+
+    if 'content' in file_data and not isinstance(file_data['content'], str):
+        problems.append('.content debe ser texto.')
+    if 'executable' in file_data and not isinstance(file_data['executable'], bool):
+        problems.append('.executable debe ser booleano (true/false).')
+
+    if problems:
+        prefix = location.format(*indices)
+        errors.extend(prefix + problem for problem in problems)
+
 # ============================================================
 # FUNCIÓN: load_template
 # ============================================================
@@ -157,12 +173,19 @@ def load_template (template_name):
     Returns:
         dict | None: El contenido de la plantilla si es válida, o `None` en caso de error.
 
+    La lectura pasa por `load_yaml_cached()` (caché validado por `mtime` y
+    tamaño), que devuelve una copia: el llamante puede modificarla libremente.
+
     Flujo de ejecución:
         1. Construye la ruta `TEMPLATES_DIR / "{template_name}.yaml"`.
-        2. Intenta abrir y parsear el YAML.
+        2. Intenta abrir y parsear el YAML (usando el caché si está vigente).
         3. Llama a `validate_template()` para comprobar su validez.
         4. Si hay errores, los muestra en consola Rich.
     """
+    # Solo se necesita para capturar `yaml.YAMLError`; ya está cargado por
+    # `yaml_cache`, así que importarlo aquí no cuesta nada.
+    import yaml
+
     template_path = TEMPLATES_DIR / f'{template_name}.yaml'
 
     if not template_path.exists():
@@ -170,8 +193,7 @@ def load_template (template_name):
         return None
 
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
+        data = load_yaml_cached(template_path) or {}
 
         valid, errors = validate_template(data)
         if not valid:
@@ -187,4 +209,36 @@ def load_template (template_name):
         return None
     except Exception as e:
         console.print(f'[red]✗[/red] Error al cargar la template: {e}')
-        return None
\ No newline at end of file
+        return None
+
+# ============================================================
+# FUNCIÓN: load_template_header
+# ============================================================
+def load_template_header (template_path):
+    """
+    Lee solo los metadatos de cabecera de una template (`HEADER_KEYS`).
+
+    Si el caché JSON de la template sigue vigente (ver `load_yaml_cached()`),
+    se usa directamente. Si no, usa `load_header()`: construye únicamente los
+    valores de las claves de cabecera, salta el resto (`structure`,
+    `global_files`...) sin crear objetos y se detiene en cuanto tiene todas
+    las claves.
+
+    Args:
+        template_path (Path): Ruta del archivo YAML de la template.
+
+    Returns:
+        dict: Las claves de cabecera encontradas (o el documento completo si
+        se tuvo que recurrir a la carga completa).
+
+    Raises:
+        OSError: Si el archivo no se puede leer.
+        yaml.YAMLError: Si la cabecera está mal formada (los errores
+            posteriores a las claves de cabecera no se detectan; ver
+            `load_header()`).
+    """
+    hit, data = read_json_cache(yaml_cache_path(template_path), file_stamp(template_path))
+    if hit:
+        return data
+
+    return load_header(template_path, HEADER_KEYS)
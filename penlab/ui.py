@@ -9,16 +9,21 @@ utilizando la librería `Rich` para mostrar banners, tablas y estructuras de dir
 de forma legible y atractiva.
 """
 
+import os
+import heapq
+from functools import lru_cache
+
 from rich.console import Console
-from rich.text import Text
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
 
 from penlab.ui_theme import THEME
 
 console = Console()
 
+# Marcado de las entradas de `build_tree`, con los estilos del tema
+# resueltos una sola vez al importar el módulo.
+_DIR_MARKUP = f"[{THEME['secondary']}]📁 {{}}[/{THEME['secondary']}]"
+_FILE_MARKUP = f"[{THEME['info']}]{{}} {{}}[/{THEME['info']}]"
+
 # ============================================================
 # FUNCIÓN: show_banner
 # ============================================================
@@ -33,6 +38,26 @@ def show_banner ():
 
     Se utiliza la librería `Rich` para colores, tablas y paneles.
     """
+    # Todo el banner se emite con una única llamada a `print`.
+    console.print(_build_banner())
+
+@lru_cache(maxsize=1)
+def _build_banner ():
+    """
+    Construye (una sola vez por proceso) el grupo de elementos Rich del
+    banner. Su contenido es constante, así que se reutiliza en cada llamada
+    a `show_banner()`; se crea al primer uso y no al importar el módulo,
+    para no penalizar a quien solo usa `build_tree`.
+
+    Por el mismo motivo, los módulos de Rich que solo usa el banner se
+    importan aquí y no al cargar el módulo.
+    """
+    from rich.console import Group
+    from rich.text import Text
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich import box
+
     banner = Text()
     banner.append("╔═══════════════════════════════════════════════════════════╗\n", style="cyan bold")
     banner.append("║                                                           ║\n", style="cyan bold")
@@ -63,13 +88,10 @@ def show_banner ():
     banner.append("                               ║\n", style="cyan bold")
     banner.append("║                                                           ║\n", style="cyan bold")
     banner.append("╚═══════════════════════════════════════════════════════════╝", style="cyan bold")
-    
-    console.print(banner)
-    console.print()
 
     # ===================== Tabla de comandos =====================
     table = Table(
-        title=f'[{THEME["primary"]}]Comandos disponibles[/{THEME['primary']}]', 
+        title=f'[{THEME["primary"]}]Comandos disponibles[/{THEME["primary"]}]', 
         box=box.ROUNDED, 
         show_header=True, 
         header_style=f'bold {THEME["primary"]}'
@@ -118,20 +140,17 @@ def show_banner ():
         'Establece un nuevo valor para una entrada de configuración'
     )
 
-    console.print(table)
-    console.print()
-
     # ===================== Panel con tips =====================
-    console.print(
-        Panel.fit(
-            f"[{THEME['warning']}]Tip:[/{THEME['warning']}] "
-            f"Usa [{THEME['primary']}]penlab init mi-proyecto --template htb --target 10.10.10.50[/{THEME['primary']}] para comenzar\n"
-            f"[{THEME['warning']}]Docs:[/{THEME['warning']}] https://github.com/hellsinki/penlab",
-            title=f"[{THEME['primary']}]Getting Started[/{THEME['primary']}]",
-            border_style=THEME['primary']
-        )
+    panel = Panel.fit(
+        f"[{THEME['warning']}]Tip:[/{THEME['warning']}] "
+        f"Usa [{THEME['primary']}]penlab init mi-proyecto --template htb --target 10.10.10.50[/{THEME['primary']}] para comenzar\n"
+        f"[{THEME['warning']}]Docs:[/{THEME['warning']}] https://github.com/hellsinki/penlab",
+        title=f"[{THEME['primary']}]Getting Started[/{THEME['primary']}]",
+        border_style=THEME['primary']
     )
 
+    return Group(banner, Text(), table, Text(), panel)
+
 # ============================================================
 # FUNCIÓN: build_tree
 # ============================================================
@@ -145,7 +164,7 @@ def build_tree (tree, path, max_depth = 3, current_depth = 0):
 
     Args:
         tree (Tree): Nodo raíz o subárbol sobre el que se agregan elementos.
-        path (Path): Directorio base a recorrer.
+        path (str | Path): Directorio base a recorrer.
         max_depth (int, opcional): Profundidad máxima de recursión. Por defecto 3.
         current_depth (int, opcional): Nivel actual de profundidad interna.
 
@@ -157,15 +176,19 @@ def build_tree (tree, path, max_depth = 3, current_depth = 0):
         return 
     
     try:
-        items = sorted(path.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-
-        for item in items[:20]:
-            if item.is_dir():
-                branch = tree.add(f"[{THEME['secondary']}]📁 {item.name}[/{THEME['secondary']}]")
-                build_tree(branch, item, max_depth, current_depth + 1)
+        # `DirEntry.is_dir()` usa el tipo que devuelve el propio listado del
+        # directorio, sin un `stat` extra por entrada. Solo se muestran 20
+        # entradas: `nsmallest` las elige sin ordenar el directorio completo.
+        with os.scandir(path) as it:
+            entries = heapq.nsmallest(20, it, key=lambda e: (not e.is_dir(), e.name))
+
+        for entry in entries:
+            if entry.is_dir():
+                branch = tree.add(_DIR_MARKUP.format(entry.name))
+                build_tree(branch, entry.path, max_depth, current_depth + 1)
             else:
-                icon = '📄' if item.suffix in ['.md', '.txt'] else '📜'
-                tree.add(f"[{THEME['info']}]{icon} {item.name}[/{THEME['info']}]")
+                icon = '📄' if os.path.splitext(entry.name)[1] in ('.md', '.txt') else '📜'
+                tree.add(_FILE_MARKUP.format(icon, entry.name))
     except PermissionError:
         # Ignorar directorios sin permisos de lectura
         pass
\ No newline at end of file
@@ -19,4 +19,18 @@ THEME = {
 
     "text": "white",
     "title": "bold magenta"
-}
\ No newline at end of file
+}
+
+# Estilos del tema como constantes, para usarlos directamente en el marcado
+# de Rich (`f'[{STYLE_ERROR}]✗[/{STYLE_ERROR}]'`).
+STYLE_PRIMARY = THEME['primary']
+STYLE_SECONDARY = THEME['secondary']
+STYLE_ACCENT = THEME['accent']
+STYLE_SUCCESS = THEME['success']
+STYLE_WARNING = THEME['warning']
+STYLE_ERROR = THEME['error']
+STYLE_INFO = THEME['info']
+STYLE_DIM = THEME['dim']
+STYLE_BORDER = THEME['border']
+STYLE_TEXT = THEME['text']
+STYLE_TITLE = THEME['title']
@@ -8,17 +8,27 @@ Este módulo agrupa funciones auxiliares utilizadas por el núcleo del framework
 especialmente para validación de rutas, limpieza de nombres de archivo y
 simulación visual de estructuras de proyecto (modo `--dry-run`).
 """
+import os
 import re
+import stat
+from functools import lru_cache
 from pathlib import Path
-from rich.console import Console
+from rich.console import Console, Group
 
 console = Console()
 
-INVALID_FILENAME_REGEX = re.compile(r'[<>:"/\\|?\*\x00]')
+INVALID_FILENAME_CHARS = '<>:"/\\|?*\x00'
+WHITESPACE_REGEX = re.compile(r'\s+')
+
+# Tablas de `str.translate` por carácter de reemplazo (se crean al primer uso).
+_INVALID_FILENAME_TABLES = {}
+
+PLACEHOLDER_REGEX = re.compile(r'\{([^{}]+)\}')
 
 # ============================================================
 # FUNCIÓN: sanitize_name
 # ============================================================
+@lru_cache(maxsize=512)
 def sanitize_name (name: str, replace_with: str = '_') -> str:
     """
     Limpia un nombre de archivo o directorio reemplazando caracteres inválidos.
@@ -33,43 +43,125 @@ def sanitize_name (name: str, replace_with: str = '_') -> str:
 
     Returns:
         str: Nombre limpio y seguro para usar en el sistema de archivos.
+
+    El resultado se memoriza: las templates suelen repetir los mismos nombres
+    de directorios y archivos entre ramas y entre el modo DRY-RUN y la creación.
     """    
     if not isinstance(name, str):
         name = str(name)
 
-    name = INVALID_FILENAME_REGEX.sub(replace_with, name)
-    name = re.sub(r'\s+', ' ', name).strip()
+    table = _INVALID_FILENAME_TABLES.get(replace_with)
+    if table is None:
+        table = str.maketrans(dict.fromkeys(INVALID_FILENAME_CHARS, replace_with))
+        _INVALID_FILENAME_TABLES[replace_with] = table
+
+    name = name.translate(table)
+
+    # Solo se colapsan espacios si hay dobles espacios u otros separadores
+    # (tabuladores, saltos de línea...), que `isprintable()` detecta en C.
+    if '  ' in name or not name.isprintable():
+        name = WHITESPACE_REGEX.sub(' ', name)
+
+    name = name.strip()
 
     return name[:255] if len(name) > 255 else name
 
 # ============================================================
-# FUNCIÓN: is_within_directory
+# FUNCIÓN: substitute_variables
 # ============================================================
-def is_within_directory (base: Path, target: Path) -> bool:
+def substitute_variables (text: str, variables: dict) -> str:
     """
-    Comprueba que una ruta objetivo (`target`) esté dentro del directorio base (`base`).
+    Sustituye los placeholders `{variable}` de un texto en una sola pasada.
+
+    Los placeholders que no corresponden a ninguna variable (por ejemplo
+    `${HOME}` o `{print $1}` en un script) se dejan tal cual.
+
+    Args:
+        text (str): Texto con placeholders (nombre de archivo, directorio o contenido).
+        variables (dict): Variables dinámicas a sustituir.
+
+    Returns:
+        str: Texto con las variables sustituidas.
+    """
+    if '{' not in text:
+        return text
+
+    def replace (match):
+        key = match.group(1)
+        return str(variables[key]) if key in variables else match.group(0)
+
+    return PLACEHOLDER_REGEX.sub(replace, text)
+
+# ============================================================
+# FUNCIÓN: resolve_within
+# ============================================================
+def resolve_within (base_resolved: Path, target: Path):
+    """
+    Resuelve `target` y lo devuelve solo si queda dentro de `base_resolved`.
 
     Previene accesos fuera de la carpeta del proyecto (ataques de path traversal)
-    y garantiza que las rutas generadas sean seguras.
+    y devuelve además la ruta resuelta, que sirve de base a los subdirectorios
+    sin resolverla dos veces. El directorio base debe llegar ya resuelto
+    (`Path.resolve()`): así quien valida muchas rutas contra la misma base la
+    resuelve una sola vez.
 
     Args:
-        base (Path): Directorio raíz permitido.
+        base_resolved (Path): Directorio raíz permitido, ya resuelto.
         target (Path): Ruta que se desea validar.
 
     Returns:
-        bool: True si `target` se encuentra dentro de `base`, False en caso contrario.
+        Path | None: La ruta resuelta, o `None` si queda fuera de la base o
+        no se puede resolver.
     """
     try:
-        base_res = base.resolve()
-        target_res = target.resolve()
+        resolved = target.resolve()
     except Exception:
-        return False
+        # OSError/RuntimeError si la ruta no se puede resolver.
+        return None
+
+    return resolved if resolved.is_relative_to(base_resolved) else None
     
+# ============================================================
+# FUNCIÓN: resolve_child
+# ============================================================
+def resolve_child (parent_resolved: Path, name: str):
+    """
+    Igual que `resolve_within(parent_resolved, parent_resolved / name)`, pero
+    sin resolver la ruta completa cuando no hace falta.
+
+    Cada nodo de la template se valida contra su propio padre (no solo contra
+    la raíz del proyecto): un `..` dentro de un subdirectorio se rechaza
+    aunque siguiera quedando dentro del proyecto.
+
+    Si `name` es un único componente normal, la ruta resuelta del hijo es
+    `parent_resolved / name` salvo que el hijo sea un enlace simbólico: basta
+    con un `lstat` en lugar de recorrer toda la ruta componente a componente.
+    En cualquier otro caso (`..`, separadores, enlaces, errores) se recurre a
+    `resolve_within()`.
+
+    Args:
+        parent_resolved (Path): Directorio padre, ya resuelto y validado.
+        name (str): Nombre del hijo (ya sanitizado).
+
+    Returns:
+        Path | None: La ruta resuelta, o `None` si queda fuera del padre o
+        no se puede resolver.
+    """
+    child = parent_resolved / name
+
+    if name in ('', '.', '..') or os.sep in name or (os.altsep and os.altsep in name):
+        return resolve_within(parent_resolved, child)
+
     try:
-        return str(target_res).startswith(str(base_res))
-    except Exception:
-        return False
-    
+        if not stat.S_ISLNK(os.lstat(child).st_mode):
+            return child
+    except FileNotFoundError:
+        return child
+    except OSError:
+        pass
+
+    return resolve_within(parent_resolved, child)
+
 # ============================================================
 # FUNCIÓN: simulate_structure
 # ============================================================
@@ -81,18 +173,28 @@ def simulate_structure(base_path: Path, structure, variables, indent=0):
     quedaría la estructura del proyecto (modo `--dry-run`), aplicando variables
     dinámicas (por ejemplo `{target}` o `{project}`).
 
+    El árbol se recorre con una pila explícita (sin recursión) en el mismo
+    orden en que aparece en la template, y la vista completa se imprime con
+    una única llamada a `console.print`.
+
     Args:
         base_path (Path): Ruta base del proyecto.
         structure (list): Lista de diccionarios que describen carpetas y archivos.
         variables (dict): Variables dinámicas a reemplazar dentro de los nombres.
-        indent (int, opcional): Nivel de indentación visual (solo para recursión interna).
+        indent (int, opcional): Nivel de indentación visual inicial.
     """
     if not isinstance(structure, (list, tuple)):
         return
-    
-    prefix = "  " * indent
-    
-    for item in structure:
+
+    # Cada entrada: (directorio padre, padre resuelto, item, nivel). Se apilan
+    # en orden inverso para desapilarlos en el orden original.
+    base_resolved = base_path.resolve()
+    stack = [(base_path, base_resolved, item, indent) for item in reversed(structure)]
+    lines = []
+
+    while stack:
+        base_path, parent_resolved, item, level = stack.pop()
+
         if not isinstance(item, dict):
             continue
         
@@ -100,30 +202,34 @@ def simulate_structure(base_path: Path, structure, variables, indent=0):
         if not raw_dir:
             continue
 
-        dir_name = str(raw_dir)
-        for var, val in variables.items():
-            dir_name = dir_name.replace(f'{{{var}}}', val)
+        prefix = "  " * level
 
+        dir_name = substitute_variables(str(raw_dir), variables)
         dir_name = sanitize_name(dir_name, replace_with='-')
         dir_path = base_path / dir_name
 
-        if not is_within_directory(base_path, dir_path):
-            console.print(f'{prefix}[red]✗ INVÁLIDO:[/red] {dir_path}')
+        dir_resolved = resolve_child(parent_resolved, dir_name)
+        if dir_resolved is None:
+            lines.append(f'{prefix}[red]✗ INVÁLIDO:[/red] {dir_path}')
             continue
 
-        console.print(f'{prefix}[blue]📁 {dir_name}/[/blue]')
+        lines.append(f'{prefix}[blue]📁 {dir_name}/[/blue]')
 
         # Archivos en este directorio
         if 'files' in item:
             for file_info in item.get('files', []):
                 if isinstance(file_info, dict) and 'name' in file_info:
-                    file_name = str(file_info['name'])
-                    for var, val in variables.items():
-                        file_name = file_name.replace(f'{{{var}}}', val)
+                    file_name = substitute_variables(str(file_info['name']), variables)
                     file_name = sanitize_name(file_name, replace_with='_')
                     executable = ' [green](executable)[/green]' if file_info.get('executable') else ''
-                    console.print(f'{prefix}  📄 {file_name}{executable}')
+                    lines.append(f'{prefix}  📄 {file_name}{executable}')
 
         # Subdirectorios
-        if 'subdirs' in item:
-            simulate_structure(dir_path, item.get('subdirs', []), variables, indent + 1)
\ No newline at end of file
+        subdirs = item.get('subdirs')
+        if isinstance(subdirs, (list, tuple)) and subdirs:
+            stack.extend((dir_path, dir_resolved, sub, level + 1) for sub in reversed(subdirs))
+
+    # Cada línea se interpreta por separado (markup, emojis, resaltado), igual
+    # que con un `print` por línea, pero se renderiza todo de una vez.
+    if lines:
+        console.print(Group(*(console.render_str(line) for line in lines)))
@@ -0,0 +1,146 @@
+"""
+yaml_cache.py
+=====================
+
+Caché de archivos YAML parseados para Penlab.
+
+Combina dos niveles, ambos validados con la marca (`st_mtime_ns`, `st_size`)
+del archivo original:
+- Un LRU en memoria (`OrderedDict`) para lecturas repetidas dentro del mismo
+  proceso. Se devuelve siempre una copia profunda, de modo que el llamante
+  puede modificar los datos sin corromper el caché.
+- Un caché JSON junto al YAML (`<archivo>.yaml.json`) para invocaciones
+  sucesivas de la CLI, ya que `json` es mucho más rápido que PyYAML.
+"""
+import json
+from collections import OrderedDict
+from copy import deepcopy
+from pathlib import Path
+
+from penlab.yaml_fast import fast_load
+
+# Lectura de los cachés con `orjson` si está instalado (bastante más rápido
+# que `json` en diccionarios pequeños); la escritura usa siempre `json`.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Número máximo de archivos mantenidos en memoria.
+MAX_ENTRIES = 100
+
+# ruta -> ([st_mtime_ns, st_size], datos)
+_cache = OrderedDict()
+
+def yaml_cache_path (path: Path) -> Path:
+    """
+    Devuelve la ruta del caché JSON asociado a un archivo YAML
+    (por ejemplo, `htb.yaml` -> `htb.yaml.json`).
+    """
+    return path.with_suffix(path.suffix + '.json')
+
+def drop_yaml_cache (path: Path):
+    """
+    Elimina las entradas cacheadas (en memoria y en disco) de un archivo YAML.
+    Se usa tras sobrescribir el YAML para que la siguiente lectura no dependa
+    de la resolución del `mtime`.
+    """
+    _cache.pop(str(path), None)
+
+    try:
+        yaml_cache_path(path).unlink()
+    except OSError:
+        pass
+
+def load_yaml_cached (path: Path):
+    """
+    Carga un archivo YAML pasando por el caché en memoria y el caché JSON.
+
+    Si el caché JSON no puede escribirse (permisos, tipos no representables
+    en JSON), simplemente se ignora.
+
+    Args:
+        path (Path): Ruta del archivo YAML.
+
+    Returns:
+        Una copia de los datos parseados del YAML (o `None` si el archivo está vacío).
+
+    Raises:
+        OSError: Si el archivo YAML no se puede leer.
+        yaml.YAMLError: Si el YAML está mal formado.
+    """
+    stamp = file_stamp(path)
+    key = str(path)
+
+    entry = _cache.get(key)
+    if entry and entry[0] == stamp:
+        _cache.move_to_end(key)
+        return deepcopy(entry[1])
+
+    data = _load_with_sidecar(path, stamp)
+
+    _cache[key] = (stamp, data)
+    _cache.move_to_end(key)
+    if len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+    return deepcopy(data)
+
+def file_stamp (path: Path) -> list:
+    """ Devuelve la marca (`st_mtime_ns`, `st_size`) con la que se valida un caché. """
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+def read_json_cache (cache_path: Path, stamp: list):
+    """
+    Lee un caché JSON y devuelve sus datos si su marca coincide con `stamp`.
+
+    Returns:
+        tuple: `(True, datos)` si el caché es válido, `(False, None)` en otro caso.
+    """
+    try:
+        cached = json_loads(cache_path.read_bytes())
+
+        if cached['stamp'] == stamp:
+            return True, cached['data']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    return False, None
+
+def write_json_cache (cache_path: Path, stamp: list, data):
+    """
+    Escribe `data` en un caché JSON marcado con `stamp` (de forma atómica).
+
+    Solo se escribe si los datos sobreviven intactos al viaje de ida y vuelta
+    por JSON (que, por ejemplo, convierte claves no textuales en strings).
+    Cualquier error se ignora: el caché es opcional.
+    """
+    try:
+        payload = json.dumps({'stamp': stamp, 'data': data}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+
+    if json.loads(payload)['data'] != data:
+        return
+
+    tmp_path = cache_path.with_suffix('.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+def _load_with_sidecar (path, stamp):
+    """ Lee `path` desde su caché JSON si sigue vigente; si no, parsea el YAML y lo regenera. """
+    cache_path = yaml_cache_path(path)
+
+    hit, data = read_json_cache(cache_path, stamp)
+    if hit:
+        return data
+
+    data = fast_load(path.read_bytes())
+
+    write_json_cache(cache_path, stamp, data)
+    return data
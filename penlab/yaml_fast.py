@@ -0,0 +1,195 @@
+"""
+yaml_fast.py
+=====================
+
+Acceso centralizado a PyYAML para Penlab.
+
+Expone el loader/dumper seguro basado en **libyaml** (implementación en C)
+cuando está disponible, con los equivalentes en Python puro como respaldo.
+El resto de módulos leen YAML a través de este módulo en lugar de llamar
+directamente a `yaml.safe_load`.
+"""
+import yaml
+
+# Loader/Dumper en C (libyaml) si está disponible; si no, los de Python puro.
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# ============================================================
+# FUNCIÓN: fast_load
+# ============================================================
+def fast_load (stream):
+    """
+    Parsea un documento YAML de forma segura con el loader más rápido disponible.
+
+    Equivale a `yaml.safe_load`, pero usando libyaml si está instalado.
+    Acepta texto, bytes o un archivo abierto. Para archivos pequeños conviene
+    pasar el contenido completo como `bytes` (`path.read_bytes()`): libyaml
+    decodifica el UTF-8 y recorre el búfer sin volver a Python por cada bloque.
+
+    Args:
+        stream (str | bytes | IO): Documento YAML a parsear.
+
+    Returns:
+        Los datos del documento (o `None` si está vacío).
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+# ============================================================
+# FUNCIÓN: fast_dump
+# ============================================================
+def fast_dump (data, stream, **kwargs):
+    """
+    Serializa `data` como YAML en `stream` con el dumper más rápido disponible.
+
+    Por defecto conserva el orden de las claves, usa estilo de bloque y
+    escribe UTF-8 sin escapar. `stream` debe estar abierto en modo binario
+    (`'wb'`): libyaml codifica la salida directamente.
+
+    Args:
+        data: Datos a serializar.
+        stream (IO): Archivo abierto en modo `'wb'`.
+        **kwargs: Opciones adicionales para `yaml.dump` (sobrescriben las anteriores).
+    """
+    options = {
+        'default_flow_style': False,
+        'sort_keys': False,
+        'allow_unicode': True,
+        'encoding': 'utf-8',
+    }
+    options.update(kwargs)
+
+    yaml.dump(data, stream, Dumper=SafeDumper, **options)
+
+# ============================================================
+# FUNCIÓN: load_header
+# ============================================================
+class _HeaderFallback (Exception):
+    """ El documento tiene una forma que el lector por eventos no cubre. """
+    pass
+
+def load_header (path, keys):
+    """
+    Lee solo algunas claves de primer nivel de un archivo YAML.
+
+    Recorre el YAML como flujo de eventos: construye únicamente los valores
+    de `keys`, salta el resto sin crear objetos y se detiene en cuanto tiene
+    todas las claves.  
+    Si el documento tiene una forma inesperada (raíz que no es un mapping,
+    claves complejas, alias...), recurre a la carga completa.
+
+    Args:
+        path (Path): Ruta del archivo YAML.
+        keys (tuple): Claves de primer nivel a leer.
+
+    Returns:
+        dict: Las claves encontradas (o el documento completo si se tuvo que
+        recurrir a la carga completa).
+
+    Raises:
+        OSError: Si el archivo no se puede leer.
+        yaml.YAMLError: Si el YAML está mal formado en la parte leída. Como
+            la lectura se detiene al encontrar todas las claves, los errores
+            posteriores a ellas no se detectan (p. ej. un `structure: [` sin
+            cerrar tras la cabecera devuelve la cabecera sin error).
+    """
+    with open(path, 'rb') as f:
+        loader = SafeLoader(f)
+        try:
+            return _read_header(loader, keys)
+        except _HeaderFallback:
+            pass
+        finally:
+            loader.dispose()
+
+    return fast_load(path.read_bytes())
+
+def _read_header (loader, keys):
+    """ Extrae las claves `keys` de primer nivel del flujo de eventos de `loader`. """
+    events = iter(loader.get_event, None)
+
+    if not isinstance(next(events), yaml.StreamStartEvent):
+        raise _HeaderFallback()
+
+    event = next(events)
+    if isinstance(event, yaml.StreamEndEvent):
+        return {}
+    if not isinstance(event, yaml.DocumentStartEvent):
+        raise _HeaderFallback()
+
+    event = next(events)
+    if isinstance(event, yaml.ScalarEvent) and event.tag is None and event.value == '':
+        return {}
+    if not isinstance(event, yaml.MappingStartEvent):
+        raise _HeaderFallback()
+
+    header = {}
+
+    for event in events:
+        if isinstance(event, yaml.MappingEndEvent):
+            break
+        if not isinstance(event, yaml.ScalarEvent):
+            raise _HeaderFallback()
+
+        key = event.value
+        if key == '<<':
+            raise _HeaderFallback()
+
+        value_event = next(events)
+
+        if key in keys:
+            header[key] = loader.construct_object(_compose_event(loader, value_event, events), deep=True)
+            if len(header) == len(keys):
+                break
+        else:
+            _skip_event(value_event, events)
+
+    return header
+
+def _compose_event (loader, event, events):
+    """ Construye el nodo YAML que empieza en `event` (sin soporte de alias). """
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        return yaml.ScalarNode(tag, event.value, style=event.style)
+
+    if isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        items = []
+        for item in events:
+            if isinstance(item, yaml.SequenceEndEvent):
+                break
+            items.append(_compose_event(loader, item, events))
+        return yaml.SequenceNode(tag, items, flow_style=event.flow_style)
+
+    if isinstance(event, yaml.MappingStartEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+        pairs = []
+        for key in events:
+            if isinstance(key, yaml.MappingEndEvent):
+                break
+            pairs.append((_compose_event(loader, key, events), _compose_event(loader, next(events), events)))
+        return yaml.MappingNode(tag, pairs, flow_style=event.flow_style)
+
+    raise _HeaderFallback()
+
+def _skip_event (event, events):
+    """ Consume los eventos del nodo que empieza en `event` sin construirlo. """
+    if not isinstance(event, yaml.CollectionStartEvent):
+        return
+
+    depth = 1
+    for item in events:
+        if isinstance(item, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(item, yaml.CollectionEndEvent):
+            depth -= 1
+            if not depth:
+                return
@@ -30,14 +30,13 @@ setup(
         'Topic :: Security',
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
         'Programming Language :: Python :: 3.10',
         'Programming Language :: Python :: 3.11',
     ],
     keywords='pentesting cli cybersecurity automation yaml templates',
     license='MIT',
-    python_requires='>=3.8',
+    python_requires='>=3.9',
     install_requires=[
         'click>=8.0.0',
         'rich>=13.0.0',